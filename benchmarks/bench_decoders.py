@@ -0,0 +1,95 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Compares json decoders on schema files, schema loading and a message dump
+
+python3 benchmarks/bench_decoders.py --schemas path/to/schemas --definitions path/to/definitions
+
+Without --schemas, a synthetic schema tree (see synthetic.py) is used.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import synthetic
+
+from foris_schema import ForisValidator
+from foris_schema.decoder import available_decoders, get_decoder
+
+
+def _best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _files(paths):
+    return [
+        os.path.join(path, name) for path in paths for name in sorted(os.listdir(path))
+        if name.endswith(".json")
+    ]
+
+
+def measure(schema_paths, definitions_paths, messages, repeat):
+    files = _files(definitions_paths + schema_paths)
+    contents = []
+    for path in files:
+        with open(path, "rb") as f:
+            contents.append(f.read())
+    dump = b"\n".join(json.dumps(msg).encode() for msg in messages)
+    lines = dump.decode().splitlines()
+    print("{} schema files ({:.1f} MB), {} messages ({:.1f} MB)".format(
+        len(files), sum(map(len, contents)) / 1e6, len(lines), len(dump) / 1e6))
+
+    print("{:<8} {:>12} {:>12} {:>12}".format("decoder", "parse", "load", "messages"))
+    for name in available_decoders():
+        decoder = get_decoder(name)
+        parse = _best(lambda: [decoder.loads(e) for e in contents], repeat)
+        load = _best(
+            lambda: ForisValidator(schema_paths, definitions_paths, decoder=decoder), repeat)
+        decode = _best(lambda: [decoder.loads(e) for e in lines], repeat)
+        print("{:<8} {:>10.1f}ms {:>10.1f}ms {:>10.1f}ms".format(
+            name, parse * 1e3, load * 1e3, decode * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemas", nargs="*", default=[])
+    parser.add_argument("--definitions", nargs="*", default=[])
+    parser.add_argument("--modules", type=int, default=20, help="synthetic modules")
+    parser.add_argument("--actions", type=int, default=10, help="synthetic actions per module")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        schema_paths, definitions_paths, messages = synthetic.generate(
+            root, args.modules, args.actions)
+        if args.schemas:
+            schema_paths, definitions_paths = args.schemas, args.definitions
+        samples = messages["valid"] + messages["invalid"] + messages["error"]
+        messages = [samples[i % len(samples)] for i in range(args.messages)]
+        measure(schema_paths, definitions_paths, messages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
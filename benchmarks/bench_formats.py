@@ -0,0 +1,80 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Measures custom format checkers with repeated and unique values
+
+python3 benchmarks/bench_formats.py --checks 100000
+"""
+
+import argparse
+import random
+import timeit
+
+from foris_schema import custom_format_checkers
+from foris_schema.custom_format_checkers import format_checker
+
+
+def _ipv4(rnd):
+    return ".".join(str(rnd.randrange(256)) for _ in range(4))
+
+
+def _netmask(rnd):
+    mask = (0xFFFFFFFF << (32 - rnd.randrange(33))) & 0xFFFFFFFF
+    return ".".join(str(mask >> shift & 0xFF) for shift in (24, 16, 8, 0))
+
+
+def _ipv6(rnd):
+    return ":".join("%x" % rnd.randrange(0x10000) for _ in range(8))
+
+
+def _mac(rnd):
+    return ":".join("%02x" % rnd.randrange(256) for _ in range(6))
+
+
+GENERATORS = {
+    "ipv4netmask": _netmask,
+    "ipv4prefix": lambda rnd: "%s/%d" % (_ipv4(rnd), rnd.randrange(33)),
+    "ipv6prefix": lambda rnd: "%s/%d" % (_ipv6(rnd), rnd.randrange(129)),
+    "macaddress": _mac,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=50,
+                        help="number of distinct values in the repeated case")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print("{:<12} {:>14} {:>14}".format("format", "repeated", "unique"))
+    for name, generate in GENERATORS.items():
+        repeated = [generate(rnd) for _ in range(args.distinct)]
+        repeated = [repeated[i % len(repeated)] for i in range(args.checks)]
+        # unique values are larger than the cache, so they always miss
+        unique = [generate(rnd) for _ in range(args.checks)]
+        times = []
+        for values in (repeated, unique):
+            elapsed = timeit.timeit(
+                lambda: [format_checker.conforms(value, name) for value in values], number=1)
+            times.append(elapsed / len(values) * 1e6)
+        print("{:<12} {:>11.2f} us {:>11.2f} us".format(name, *times))
+    print("(cache size {} values per format)".format(custom_format_checkers.CACHE_SIZE))
+
+
+if __name__ == "__main__":
+    main()
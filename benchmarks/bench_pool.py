@@ -0,0 +1,80 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Measures how ForisValidatorPool throughput scales with the number of workers
+
+python3 benchmarks/bench_pool.py --messages 100000 --workers 1 2 4
+"""
+
+import argparse
+import os
+import time
+
+from foris_schema import ForisValidator
+from foris_schema.pool import ForisValidatorPool
+
+SCHEMA_PATHS = [os.path.join(os.path.dirname(__file__), "..", "tests/schemas/modules/keywords")]
+
+MESSAGES = [
+    {
+        "module": "keywords", "kind": "request", "action": "mixed",
+        "data": {
+            "port": 80, "address": "10.0.0.1", "tags": ["main", "lan"], "mode": "on",
+            "labels": {"x-a": "b", "c": 1}, "pair": ["a", True], "step": 1.5,
+        },
+    },
+    {
+        "module": "keywords", "kind": "request", "action": "tree",
+        "data": {"name": "root", "children": [
+            {"name": "a", "children": [{"name": "b"}, {"name": "c"}]}, {"name": "d"},
+        ]},
+    },
+    {
+        "module": "keywords", "kind": "request", "action": "mixed",
+        "data": {"port": 0, "address": "10.0.0.1", "mode": "on"},
+    },
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--compiled", action="store_true")
+    args = parser.parse_args()
+
+    messages = [MESSAGES[i % len(MESSAGES)] for i in range(args.messages)]
+
+    validator = ForisValidator(SCHEMA_PATHS, compiled=args.compiled)
+    start = time.perf_counter()
+    validator.validate_many(messages)
+    elapsed = time.perf_counter() - start
+    print("in-process  {:>10.0f} msg/s".format(len(messages) / elapsed))
+
+    for workers in args.workers:
+        with ForisValidatorPool(
+            SCHEMA_PATHS, workers=workers, chunk_size=args.chunk_size, compiled=args.compiled
+        ) as pool:
+            pool.validate_many(messages[:workers])  # start the workers
+            start = time.perf_counter()
+            pool.validate_many(messages)
+            elapsed = time.perf_counter() - start
+        print("{:>2} workers  {:>10.0f} msg/s".format(workers, len(messages) / elapsed))
+
+
+if __name__ == "__main__":
+    main()
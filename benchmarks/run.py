@@ -0,0 +1,200 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Measures schema load time, validation throughput and memory on synthetic schemas
+
+python3 benchmarks/run.py --modules 50 --actions 20 --definitions 40 --output results.json
+
+Results are written as json so that they can be compared across versions
+(see --compare).
+"""
+
+import argparse
+import importlib.metadata
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import jsonschema
+
+import synthetic
+
+from foris_schema import ForisValidator, __version__
+from foris_schema.metrics import ValidationMetrics
+
+
+def _init_time(schema_paths, definitions_paths, repeat, kwargs):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ForisValidator(schema_paths, definitions_paths, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _peak_memory(schema_paths, definitions_paths, kwargs):
+    tracemalloc.start()
+    validator = ForisValidator(schema_paths, definitions_paths, **kwargs)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del validator
+    return {"retained": current, "peak": peak}
+
+
+def _throughput(function, messages, duration):
+    """ Returns messages per second """
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        for msg in messages:
+            function(msg)
+        count += len(messages)
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def _validate_ignore(validator):
+    def validate(msg):
+        try:
+            validator.validate(msg)
+        except jsonschema.ValidationError:
+            pass
+    return validate
+
+
+def _validate_bytes_ignore(validator):
+    def validate(payload):
+        try:
+            validator.validate_bytes(payload)
+        except jsonschema.ValidationError:
+            pass
+    return validate
+
+
+def _decode_validate_ignore(validator):
+    def validate(payload):
+        try:
+            validator.validate(validator.decoder.loads(payload))
+        except jsonschema.ValidationError:
+            pass
+    return validate
+
+
+def run(args):
+    kwargs = {"compiled": args.compiled, "lazy": args.lazy, "load_workers": args.load_workers}
+    if args.metrics:
+        kwargs["metrics"] = ValidationMetrics()
+    with tempfile.TemporaryDirectory() as root:
+        schema_paths, definitions_paths, messages = synthetic.generate(
+            root, args.modules, args.actions, args.definitions, args.depth, args.width)
+
+        results = {
+            "init_seconds": _init_time(schema_paths, definitions_paths, args.repeat, kwargs),
+            "memory_bytes": _peak_memory(schema_paths, definitions_paths, kwargs),
+            "throughput": {},
+        }
+
+        validator = ForisValidator(schema_paths, definitions_paths, **kwargs)
+        for kind, msgs in sorted(messages.items()):
+            results["throughput"]["validate_" + kind] = _throughput(
+                _validate_ignore(validator), msgs, args.duration)
+            results["throughput"]["is_valid_" + kind] = _throughput(
+                validator.is_valid, msgs, args.duration)
+
+        # raw payloads with valid data, but an unknown module
+        payloads = {
+            "valid": [json.dumps(msg).encode() for msg in messages["valid"]],
+            "bad_envelope": [
+                json.dumps(dict(msg, module="unknown")).encode() for msg in messages["valid"]
+            ],
+        }
+        for kind, msgs in sorted(payloads.items()):
+            results["throughput"]["validate_bytes_" + kind] = _throughput(
+                _validate_bytes_ignore(validator), msgs, args.duration)
+            results["throughput"]["decode_validate_" + kind] = _throughput(
+                _decode_validate_ignore(validator), msgs, args.duration)
+
+    return {
+        "foris_schema": __version__,
+        "jsonschema": importlib.metadata.version("jsonschema"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "parameters": {
+            k: getattr(args, k)
+            for k in (
+                "modules", "actions", "definitions", "depth", "width", "compiled", "lazy",
+                "metrics", "load_workers",
+            )
+        },
+        "results": results,
+    }
+
+
+def _flatten(results, prefix=""):
+    for key, value in sorted(results.items()):
+        if isinstance(value, dict):
+            yield from _flatten(value, prefix + key + ".")
+        else:
+            yield prefix + key, value
+
+
+def compare(old, new):
+    old_values = dict(_flatten(old["results"]))
+    for key, value in _flatten(new["results"]):
+        base = old_values.get(key)
+        change = "{:+.1%}".format(value / base - 1) if base else "n/a"
+        print("{:<40} {:>14.6g} {:>14.6g} {:>9}".format(key, base or 0, value, change))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--actions", type=int, default=10)
+    parser.add_argument("--definitions", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of init measurement")
+    parser.add_argument("--duration", type=float, default=1.0,
+                        help="seconds spent measuring each throughput")
+    parser.add_argument("--compiled", action="store_true")
+    parser.add_argument("--lazy", action="store_true")
+    parser.add_argument("--metrics", action="store_true", help="enable ValidationMetrics")
+    parser.add_argument("--load-workers", type=int, default=0,
+                        help="processes used to load module schemas")
+    parser.add_argument("--output", help="write results to json file")
+    parser.add_argument("--compare", metavar="FILE", help="compare with previous results")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+    else:
+        for key, value in _flatten(results["results"]):
+            print("{:<40} {:>14.6g}".format(key, value))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
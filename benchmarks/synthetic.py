@@ -0,0 +1,127 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Generator of synthetic schema trees and matching messages """
+
+import copy
+import json
+import os
+
+
+def _definition(i):
+    """ Returns (schema, valid instance) of i-th global definition """
+    kind = i % 4
+    if kind == 0:
+        return {"type": "string", "pattern": "^[a-z]+[0-9]*$"}, "value%d" % i
+    if kind == 1:
+        return {"type": "integer", "minimum": 0, "maximum": 1000 + i}, i
+    if kind == 2:
+        return {"enum": ["on", "off", "auto"]}, "auto"
+    # object referencing the previous definition (which is always the enum)
+    schema = {
+        "type": "object",
+        "properties": {
+            "enabled": {"type": "boolean"},
+            "value": {"$ref": "#/definitions/def_%d" % (i - 1)},
+        },
+        "additionalProperties": False,
+        "required": ["enabled", "value"],
+    }
+    return schema, {"enabled": True, "value": "auto"}
+
+
+def _definitions(count):
+    schemas = {}
+    samples = {}
+    for i in range(count):
+        schemas["def_%d" % i], samples["def_%d" % i] = _definition(i)
+    return schemas, samples
+
+
+def _nested(depth, width, samples, seed):
+    """ Returns (schema, valid instance) of a nested object """
+    names = sorted(samples)
+    if depth == 0:
+        name = names[seed % len(names)] if names else None
+        if name is None:
+            return {"type": "string", "maxLength": 32}, "leaf"
+        return {"$ref": "#/definitions/%s" % name}, copy.deepcopy(samples[name])
+
+    properties = {"name": {"type": "string", "minLength": 1}}
+    instance = {"name": "level%d" % depth}
+    for i in range(width):
+        schema, value = _nested(depth - 1, width, samples, seed + i)
+        properties["child%d" % i] = schema
+        instance["child%d" % i] = value
+    item_schema, item = _nested(depth - 1, 1, samples, seed + width)
+    properties["items"] = {"type": "array", "items": item_schema, "maxItems": 16}
+    instance["items"] = [item, copy.deepcopy(item)]
+
+    return {
+        "type": "object",
+        "properties": properties,
+        "additionalProperties": False,
+        "required": sorted(properties),
+    }, instance
+
+
+def generate(root, modules=10, actions=10, definitions=20, depth=3, width=2):
+    """ Writes synthetic schemas into root/modules and root/definitions
+
+    :returns: (schema_paths, definitions_paths, messages) where messages is a dict with lists
+              of "valid", "invalid" and "error" messages
+    """
+    modules_dir = os.path.join(root, "modules")
+    definitions_dir = os.path.join(root, "definitions")
+    os.makedirs(modules_dir, exist_ok=True)
+    os.makedirs(definitions_dir, exist_ok=True)
+
+    definition_schemas, samples = _definitions(definitions)
+    with open(os.path.join(definitions_dir, "definitions.json"), "w") as f:
+        json.dump({"definitions": definition_schemas}, f, indent=1)
+
+    messages = {"valid": [], "invalid": [], "error": []}
+    for m in range(modules):
+        module_name = "module%d" % m
+        branches = []
+        for a in range(actions):
+            action = "action%d" % a
+            data_schema, data = _nested(depth, width, samples, m * actions + a)
+            for kind in ("request", "reply"):
+                branches.append({
+                    "description": "%s %s of %s" % (kind, action, module_name),
+                    "properties": {
+                        "module": {"enum": [module_name]},
+                        "kind": {"enum": [kind]},
+                        "action": {"enum": [action]},
+                        "data": data_schema,
+                    },
+                    "additionalProperties": False,
+                    "required": ["data"],
+                })
+
+            envelope = {"module": module_name, "kind": "reply", "action": action}
+            messages["valid"].append(dict(envelope, data=data))
+            invalid = copy.deepcopy(data)
+            invalid["name"] = ""
+            messages["invalid"].append(dict(envelope, data=invalid))
+            messages["error"].append(dict(envelope, errors=[
+                {"description": "failed", "stacktrace": "Traceback..."}]))
+
+        with open(os.path.join(modules_dir, module_name + ".json"), "w") as f:
+            json.dump({"oneOf": branches}, f, indent=1)
+
+    return [modules_dir], [definitions_dir], messages
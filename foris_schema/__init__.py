@@ -16,8 +16,15 @@
 
 __version__ = "0.9.0"
 
-from .validator import ForisValidator
-
 __all__ = [
     "ForisValidator",
 ]
+
+
+def __getattr__(name):
+    # the validator (and jsonschema) is imported on first use,
+    # so that the command line client of the daemon starts fast
+    if name == "ForisValidator":
+        from .validator import ForisValidator
+        return ForisValidator
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,80 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" asyncio interface of ForisValidator """
+
+import asyncio
+
+
+def message_size(msg, limit):
+    """ Counts json nodes of the message (strings count by their length)
+
+    Counting stops when the limit is exceeded, so it is cheap for large messages as well.
+    """
+    size = 0
+    stack = [msg]
+    while stack:
+        item = stack.pop()
+        size += 1
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str):
+            size += len(item) // 64
+        if size > limit:
+            break
+    return size
+
+
+class AsyncForisValidator(object):
+    """ Validates messages without blocking the event loop
+
+    Small messages are validated directly in the event loop, because passing them
+    to an executor would cost more than the validation itself. Larger messages are
+    validated in the executor and the number of such concurrent validations is limited.
+    """
+
+    def __init__(self, validator, executor=None, max_inline_size=256, max_concurrency=4):
+        """
+        :param validator: ForisValidator instance
+        :param executor: executor for large messages (None means the loop's default executor)
+        :param max_inline_size: maximal size of a message validated inline (see message_size())
+        :param max_concurrency: maximal number of messages validated in the executor at once
+        """
+        self.validator = validator
+        self.executor = executor
+        self.max_inline_size = max_inline_size
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def _run(self, function, msg):
+        if message_size(msg, self.max_inline_size) <= self.max_inline_size:
+            return function(msg)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, msg)
+
+    async def validate(self, msg):
+        """ Same as ForisValidator.validate() """
+        return await self._run(self.validator.validate, msg)
+
+    async def is_valid(self, msg):
+        """ Same as ForisValidator.is_valid() """
+        return await self._run(self.validator.is_valid, msg)
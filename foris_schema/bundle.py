@@ -0,0 +1,179 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Single-file bundle of verified schemas
+
+A bundle contains all module schemas and global definitions loaded from the source
+directories, so that they can be loaded by a single read instead of listing the directories
+and reading every file (see ForisValidator.build_bundle() and ForisValidator.from_bundle()).
+Global definitions are stored only once.
+"""
+
+import json
+import os
+import tempfile
+
+from . import __version__
+from .cache import file_digest, pack_modules, unpack_modules
+from .decoder import get_decoder
+
+FORMAT = "foris-schema-bundle"
+VERSION = 1
+
+# ways to find out whether the source files changed since the bundle was built
+CHECKS = ("names", "contents")
+
+
+class BundleError(Exception):
+    pass
+
+
+class StaleBundleError(BundleError):
+    pass
+
+
+class Bundle(object):
+    """ Loaded and verified schemas together with the description of their source files """
+
+    def __init__(
+        self, schema_paths, definitions_paths, files, definitions, modules,
+        version=VERSION, foris_schema=__version__,
+    ):
+        """
+        :param schema_paths: absolute paths of directories with module schemas
+        :param definitions_paths: absolute paths of directories with global definitions
+        :param files: [(path, mtime_ns, size, digest)] of all source files (definitions first,
+                      in the order of loading)
+        :param definitions: global definitions
+        :param modules: {module_name: schema} (with the global definitions filled in)
+        """
+        self.schema_paths = schema_paths
+        self.definitions_paths = definitions_paths
+        self.files = files
+        self.definitions = definitions
+        self.modules = modules
+        self.version = version
+        self.foris_schema = foris_schema
+
+    @property
+    def sources(self):
+        """ {path: (mtime_ns, size)} of the source files """
+        return {path: (mtime, size) for path, mtime, size, _ in self.files}
+
+    @property
+    def definition_files(self):
+        return [
+            path for path, _, _, _ in self.files
+            if os.path.dirname(path) in self.definitions_paths
+        ]
+
+    @property
+    def module_files(self):
+        """ {module_name: path} """
+        return {
+            os.path.basename(path)[:-5]: path for path, _, _, _ in self.files
+            if os.path.dirname(path) in self.schema_paths
+        }
+
+    @staticmethod
+    def load(path, decoder=None):
+        """ Reads the bundle file
+
+        :param decoder: json decoder (see foris_schema.decoder)
+        :raises BundleError: when the file is not a bundle or its version is not supported
+        """
+        try:
+            data = get_decoder(decoder).load_file(path)
+        except ValueError as e:
+            raise BundleError("Error loading bundle {}, reason: {!r}".format(path, e)) from e
+        if not isinstance(data, dict) or data.get("format") != FORMAT:
+            raise BundleError("File {} is not a schema bundle".format(path))
+
+        if data.get("version") != VERSION:
+            raise BundleError("Bundle {} has unsupported version {!r} (expected {})".format(
+                path, data.get("version"), VERSION))
+
+        definitions = data["definitions"]
+        modules = data["modules"]
+        unpack_modules(definitions, modules, data["global_definitions"])
+        return Bundle(
+            data["schema_paths"], data["definitions_paths"],
+            [tuple(e) for e in data["files"]], definitions, modules,
+            data["version"], data["foris_schema"],
+        )
+
+    def store(self, path):
+        """ Writes the bundle file (the previous one is replaced at once) """
+        modules, global_definitions = pack_modules(self.definitions, self.modules)
+        data = {
+            "format": FORMAT,
+            "version": self.version,
+            "foris_schema": self.foris_schema,
+            "schema_paths": self.schema_paths,
+            "definitions_paths": self.definitions_paths,
+            "files": [list(e) for e in self.files],
+            "definitions": self.definitions,
+            "modules": modules,
+            "global_definitions": global_definitions,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _current_files(self, precise):
+        files = set()
+        for directory in self.definitions_paths + self.schema_paths:
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if name.endswith(".json") and (not precise or os.path.isfile(path)):
+                    files.add(path)
+        return files
+
+    def stale_reason(self, check="contents"):
+        """ Finds out whether the bundle differs from its source files
+
+        :param check: "contents" compares names of files in the source directories and sizes
+                      and mtimes of the files (and their content hashes when these differ),
+                      "names" compares only the names (a file added, removed or renamed),
+                      so files rewritten in place are not noticed
+        :returns: description of the difference or None when the bundle is up to date
+        """
+        if check not in CHECKS:
+            raise ValueError("Unknown bundle check %r (available: %s)" % (check, CHECKS))
+        if self.foris_schema != __version__:
+            return "built by foris-schema {}".format(self.foris_schema)
+
+        expected = {path for path, _, _, _ in self.files}
+        try:
+            # listing is enough unless some directory is named *.json
+            if self._current_files(False) != expected \
+                    and self._current_files(True) != expected:
+                return "files were added or removed"
+            if check == "contents":
+                for path, mtime, size, digest in self.files:
+                    st = os.stat(path)
+                    if (st.st_mtime_ns, st.st_size) != (mtime, size) \
+                            and file_digest(path) != digest:
+                        return "file {} was modified".format(path)
+        except OSError as e:
+            return "source files can't be read: {}".format(e)
+        return None
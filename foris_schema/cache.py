@@ -0,0 +1,211 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+from . import __version__
+from .decoder import get_decoder
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def pack_modules(definitions, modules):
+    """ Removes global definitions from module schemas, so that they are stored only once
+
+    :returns: (modules without global definitions, {module_name: [names of global definitions]})
+    """
+    packed = {
+        module_name: dict(schema, definitions={
+            k: v for k, v in schema["definitions"].items() if definitions.get(k) is not v
+        })
+        for module_name, schema in modules.items()
+    }
+    global_definitions = {
+        module_name: [k for k, v in schema["definitions"].items() if definitions.get(k) is v]
+        for module_name, schema in modules.items()
+    }
+    return packed, global_definitions
+
+
+def unpack_modules(definitions, modules, global_definitions):
+    """ Fills global definitions removed by pack_modules() back (modules are modified) """
+    for module_name, schema in modules.items():
+        local_definitions = schema["definitions"]
+        for name in global_definitions[module_name]:
+            local_definitions[name] = definitions[name]
+    return modules
+
+
+class SchemaCache(object):
+    """ Stores already loaded and verified schemas between runs
+
+    The cache is keyed by the list of source files together with their mtimes and
+    sizes. When mtime or size differ, content hashes are compared to find out
+    whether the file really changed.
+    """
+
+    VERSION = 2
+
+    def __init__(self, cache_dir, files, key, decoder=None):
+        """
+        :param cache_dir: directory where the cache file is stored
+        :param files: ordered list of all source files (definitions and modules)
+        :param key: identifies the set of source directories
+        :param decoder: json decoder of the cache file (see foris_schema.decoder)
+        """
+        self.files = files
+        self.decoder = get_decoder(decoder)
+        self.path = os.path.join(
+            cache_dir,
+            "foris-schema-%s.json" % hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        )
+        self.stats = {}
+
+    def _stat(self):
+        self.stats = {}
+        for path in self.files:
+            st = os.stat(path)
+            self.stats[path] = (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        """ Returns (definitions, modules) or None when the cache is missing or stale """
+        self._stat()
+        try:
+            cached = self.decoder.load_file(self.path)
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("version") != self.VERSION or cached.get("foris_schema") != __version__:
+            return None
+
+        sources = cached["sources"]
+        if [e[0] for e in sources] != self.files:
+            return None  # files were added or removed
+        for path, mtime, size, digest in sources:
+            if self.stats[path] != (mtime, size) and file_digest(path) != digest:
+                return None
+
+        definitions = cached["definitions"]
+        return definitions, unpack_modules(
+            definitions, cached["modules"], cached["global_definitions"])
+
+    def store(self, definitions, modules):
+        stats = self.stats
+        self._stat()
+        if stats != self.stats:
+            return  # files were modified while loading
+
+        packed, global_definitions = pack_modules(definitions, modules)
+        data = {
+            "version": self.VERSION,
+            "foris_schema": __version__,
+            "sources": [
+                [path, *self.stats[path], file_digest(path)] for path in self.files
+            ],
+            "definitions": definitions,
+            "modules": packed,
+            # names of global definitions used by modules
+            "global_definitions": global_definitions,
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Failed to store schema cache %s: %r", self.path, e)
+
+
+class ResultCache(object):
+    """ Bounded LRU cache of validation results
+
+    Messages are identified by their canonical json representation. Only messages which
+    are equal to their json representation decoded back (i.e. plain json data) are cached,
+    so e.g. non-string keys can't be mistaken for string ones.
+
+    The generation is increased by clear(). Results computed before that are not stored
+    when put() gets the generation read before the validation.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # fingerprint -> (message, valid, error)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+
+    @staticmethod
+    def fingerprint(msg):
+        """ Returns canonical representation of the message or None if it can't be cached """
+        try:
+            return json.dumps(msg, sort_keys=True, separators=(",", ":"), allow_nan=False)
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, fingerprint, msg):
+        """ Returns (valid, error) or None when there is no cached result """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or entry[0] != msg:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, fingerprint, msg, valid, error=None, generation=None):
+        canonical = json.loads(fingerprint)
+        if canonical != msg:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return  # the cache was cleared during the validation
+            self._entries[fingerprint] = (canonical, valid, error)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
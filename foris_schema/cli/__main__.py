@@ -1,8 +1,29 @@
+# foris-schema.cli
+# Copyright (C) 2020 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
 import argparse
-import json
+import itertools
+import signal
+import sys
+import time
+from collections import Counter
 from json.decoder import JSONDecodeError
 from sys import stdin
-from foris_schema.validator import ForisValidator
+from foris_schema.decoder import available_decoders, get_decoder
+from foris_schema.cli.daemon import DaemonUnavailable, ValidationServer, validate_remote
 
 
 class NotJson(Exception):
@@ -11,7 +32,7 @@ class NotJson(Exception):
 
 def _inject_input_args(p: argparse.ArgumentParser):
     """p: parser"""
-    inputs = p.add_mutually_exclusive_group(required=True)
+    inputs = p.add_mutually_exclusive_group()
     inputs.add_argument(
         '-i',
         metavar='FILE',
@@ -25,6 +46,83 @@ def _inject_input_args(p: argparse.ArgumentParser):
         help='Raw-string json input.')
 
 
+def _create_validator(args, decoder):
+    # jsonschema is imported only when the message is not validated by the daemon
+    from foris_schema.validator import ForisValidator
+    return ForisValidator(args.schemas, args.d or [], decoder=decoder)
+
+
+def _message_label(msg):
+    if isinstance(msg, dict):
+        return "{}/{}/{}".format(msg.get("module"), msg.get("kind"), msg.get("action"))
+    return "<not an object>"
+
+
+def validate_stream(
+    validator, lines, out=sys.stdout, summary_out=sys.stderr, chunk_size=256, decoder=None,
+):
+    """ Validates newline-delimited json messages
+
+    Prints a result for each line and a summary at the end.
+    Lines are processed in chunks, so the memory usage doesn't grow with the input size.
+
+    :param decoder: json decoder of the lines (see foris_schema.decoder)
+    :returns: number of failed messages
+    """
+    decoder = get_decoder(decoder)
+    counts = Counter()
+    failures = Counter()
+    start = time.perf_counter()
+
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            break
+
+        parsed = []
+        for number, line in chunk:
+            try:
+                parsed.append((number, decoder.loads(line), None))
+            except JSONDecodeError as e:
+                parsed.append((number, None, e))
+
+        results = iter(validator.validate_many(msg for _, msg, e in parsed if e is None))
+        for number, msg, decode_error in parsed:
+            if decode_error is not None:
+                counts["not json"] += 1
+                failures["<not json>"] += 1
+                print("{}: not json: {}".format(number, decode_error), file=out)
+                continue
+
+            result = next(results)
+            label = _message_label(msg)
+            if not result.valid:
+                counts["invalid"] += 1
+                failures[label] += 1
+                print("{}: invalid {}: {}".format(number, label, result.error.message), file=out)
+            elif result.error_message:
+                counts["error message"] += 1
+                print("{}: error message {}".format(number, label), file=out)
+            else:
+                counts["valid"] += 1
+                print("{}: valid {}".format(number, label), file=out)
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print("Messages: {}".format(total), file=summary_out)
+    for name in ("valid", "error message", "invalid", "not json"):
+        print("  {}: {}".format(name, counts[name]), file=summary_out)
+    if failures:
+        print("Failures:", file=summary_out)
+        for label, count in failures.most_common():
+            print("  {}: {}".format(label, count), file=summary_out)
+    print("Throughput: {:.0f} messages/s".format(total / elapsed if elapsed else 0),
+          file=summary_out)
+
+    return counts["invalid"] + counts["not json"]
+
+
 def main():
     """ We do not need to handle non-existent schema paths as ForisValidator already
 catches such errors. """
@@ -40,45 +138,121 @@ You can also provide JSON using stdin PIPE.'''
         nargs="*",
         help='Paths to folders containing custom defintions. Not required.'
     )
+    _inject_input_args(parser)
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Input (FILE or stdin) contains one json message per line. '
+        'Each message is validated and a summary is printed at the end.'
+    )
+    daemon = parser.add_mutually_exclusive_group()
+    daemon.add_argument(
+        '--serve',
+        metavar='SOCKET',
+        help='Run a daemon which keeps the schemas loaded and validates messages '
+        'received over the unix SOCKET.'
+    )
+    daemon.add_argument(
+        '--bundle',
+        metavar='FILE',
+        help='Load and verify the schemas and write them into a single bundle FILE '
+        '(see ForisValidator.from_bundle()).'
+    )
+    daemon.add_argument(
+        '--socket',
+        metavar='SOCKET',
+        help='Validate using a daemon listening on the unix SOCKET. '
+        'The validation is performed in-process when the daemon is not running.'
+    )
+    parser.add_argument(
+        '--json-decoder',
+        choices=available_decoders(),
+        help='Json decoder of schemas and input (default: the fastest installed one).'
+    )
+    parser.add_argument(
+        'schemas',
+        nargs="+",
+        help='Paths to folders with schemas to validate against.'
+    )
+
+    args = parser.parse_args()
+
+    if args.ndjson and args.r is not None:
+        parser.error("argument -r: not allowed with argument --ndjson")
+    if args.serve and (args.ndjson or args.i is not None or args.r is not None):
+        parser.error("argument --serve: not allowed with input arguments")
+    if args.bundle and (args.ndjson or args.i is not None or args.r is not None):
+        parser.error("argument --bundle: not allowed with input arguments")
+    if args.socket and args.ndjson:
+        parser.error("argument --socket: not allowed with argument --ndjson")
+
+    decoder = get_decoder(args.json_decoder)
+
+    if args.bundle:
+        from foris_schema.validator import ForisValidator
+        bundle = ForisValidator.build_bundle(
+            args.bundle, args.schemas, args.d or [], decoder=decoder)
+        print("Bundle {}: {} modules, {} definitions".format(
+            args.bundle, len(bundle.modules), len(bundle.definitions)))
+        return
+
+    if args.serve:
+        validator = _create_validator(args, decoder)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        with ValidationServer(args.serve, validator, args.schemas, args.d or []) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
 
     # input file
     input_json = None
 
-    if stdin.isatty():
-        # if input JSON string is provided by pipe below arguments are not required.
-        _inject_input_args(parser)
-    else:
+    if args.i is None and args.r is None and not args.ndjson:
+        if stdin.isatty():
+            parser.error("one of the arguments -i -r is required")
+
         # check wheter we can parse stream to json
         in_stream = stdin.read()
         try:
-            input_json = json.loads(in_stream)
+            input_json = decoder.loads(in_stream)
         except JSONDecodeError as e:
             if in_stream == '':
                 # in Docker environment empty b'' is passed to PIPE no matter what
-                _inject_input_args(parser)
+                parser.error("one of the arguments -i -r is required")
             else:
                 raise NotJson(f"Input is not a valid json:\n{in_stream}") from e
 
-    parser.add_argument(
-        'schemas',
-        nargs="+",
-        help='Paths to folders with schemas to validate against.'
-    )
-
-    args = parser.parse_args()
-
-    # prepare validator
-    validator = ForisValidator(args.schemas, args.d or [])
+    if args.ndjson:
+        validator = _create_validator(args, decoder)
+        if args.i is not None:
+            with open(args.i, 'r') as f:
+                failed = validate_stream(validator, f, decoder=decoder)
+        else:
+            failed = validate_stream(validator, stdin, decoder=decoder)
+        sys.exit(1 if failed else 0)
 
     # prepare data provided using either `-i` or `-r` arguments
     if input_json is None:
         if args.r is not None:
-            input_json = json.loads(args.r)
+            input_json = decoder.loads(args.r)
 
         if args.i is not None:
-            with open(args.i, 'r') as f:
-                input_json = json.load(f)
+            input_json = decoder.load_file(args.i)
 
+    if args.socket:
+        try:
+            valid, error = validate_remote(args.socket, args.schemas, args.d or [], input_json)
+        except DaemonUnavailable:
+            pass  # fallback to in-process validation
+        else:
+            if not valid:
+                sys.exit(f"jsonschema.exceptions.ValidationError: {error}")
+            return
+
+    # prepare validator
+    validator = _create_validator(args, decoder)
     validator.validate(input_json)
 
 
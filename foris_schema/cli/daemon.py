@@ -0,0 +1,132 @@
+# foris-schema.cli
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+""" Validation daemon which keeps the schemas loaded between foris-schema invocations
+
+Protocol: the client sends one json object per line
+    {"schemas": [...], "definitions": [...], "message": {...}}
+and the daemon answers with one json object per line
+    {"valid": true|false, "error": "..."}
+Paths are compared as absolute paths, when they don't match the paths the daemon was
+started with, the daemon answers with {"valid": null, "error": "..."}.
+Changed schema files are reloaded before each validation, when they can't be loaded,
+the daemon answers with {"valid": null, "error": "..."} as well.
+
+The client part doesn't import jsonschema, so it costs little more than the socket round trip.
+"""
+import json
+import os
+import socket
+import socketserver
+import stat
+
+
+class DaemonUnavailable(Exception):
+    pass
+
+
+def _normalize_paths(paths):
+    return [os.path.abspath(e) for e in paths]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            self.wfile.write(json.dumps(self.server.process(line)).encode() + b"\n")
+            self.wfile.flush()
+
+
+class ValidationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, validator, schema_paths, definitions_paths):
+        self.validator = validator
+        self.schema_paths = _normalize_paths(schema_paths)
+        self.definitions_paths = _normalize_paths(definitions_paths)
+
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise RuntimeError("{} exists and it is not a socket".format(socket_path))
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                    s.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)  # stale socket
+            else:
+                raise RuntimeError("Daemon is already running on {}".format(socket_path))
+
+        super().__init__(socket_path, _Handler)
+
+    def process(self, line):
+        try:
+            request = json.loads(line)
+            paths = (request["schemas"], request.get("definitions", []))
+            message = request["message"]
+        except (ValueError, KeyError, TypeError) as e:
+            return {"valid": None, "error": "Malformed request: {!r}".format(e)}
+
+        if (_normalize_paths(paths[0]), _normalize_paths(paths[1])) != \
+                (self.schema_paths, self.definitions_paths):
+            return {"valid": None, "error": "Daemon serves different schemas"}
+
+        # e.g. a package hook installed a plugin with new schemas
+        try:
+            self.validator.reload()
+        except Exception as e:
+            return {"valid": None, "error": "Failed to reload schemas: {!r}".format(e)}
+
+        from jsonschema import ValidationError
+
+        try:
+            self.validator.validate(message)
+        except ValidationError as e:
+            return {"valid": False, "error": str(e)}
+        return {"valid": True, "error": None}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def validate_remote(socket_path, schema_paths, definitions_paths, message, timeout=10.0):
+    """ Validates the message using a running daemon
+
+    :returns: (valid, error)
+    :raises DaemonUnavailable: when the daemon is not running or it can't validate the message
+    """
+    request = json.dumps({
+        "schemas": _normalize_paths(schema_paths),
+        "definitions": _normalize_paths(definitions_paths),
+        "message": message,
+    }).encode() + b"\n"
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(socket_path)
+            s.sendall(request)
+            with s.makefile("rb") as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(repr(e)) from e
+
+    if response.get("valid") is None:
+        raise DaemonUnavailable(response.get("error"))
+    return response["valid"], response["error"]
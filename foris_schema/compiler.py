@@ -0,0 +1,387 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Compiles Draft 7 json schemas into plain python functions
+
+The generated functions only answer whether the instance is valid or not.
+They are meant to be used as a fast path; detailed errors should still be
+obtained from Draft7Validator.
+"""
+
+import numbers
+import re
+
+from fractions import Fraction
+from urllib.parse import unquote
+
+from jsonschema import Draft7Validator
+
+from .custom_format_checkers import format_checker as default_format_checker
+
+
+# keywords which don't affect the validation result
+ANNOTATIONS = {
+    "$schema", "$comment", "definitions", "title", "description", "default", "examples",
+    "readOnly", "writeOnly", "contentMediaType", "contentEncoding",
+    "then", "else",  # handled together with "if"
+}
+
+TYPE_CHECKS = {
+    "object": "isinstance({0}, dict)",
+    "array": "isinstance({0}, list)",
+    "string": "isinstance({0}, str)",
+    "boolean": "isinstance({0}, bool)",
+    "null": "{0} is None",
+    "integer": "(isinstance({0}, int) and not isinstance({0}, bool)"
+               " or isinstance({0}, float) and {0}.is_integer())",
+    "number": "(isinstance({0}, Number) and not isinstance({0}, bool))",
+}
+
+
+class SchemaCompilationError(Exception):
+    pass
+
+
+# enum, const and uniqueItems compare values the same way as the installed jsonschema
+_draft7_keywords = Draft7Validator.VALIDATORS
+_draft7_validator = Draft7Validator(True)
+
+
+def _keyword_valid(keyword, value, instance):
+    errors = _draft7_keywords[keyword](_draft7_validator, value, instance, {})
+    return next(errors, None) is None
+
+
+def _multiple_of(instance, dB):
+    if isinstance(dB, float):
+        quotient = instance / dB
+        try:
+            return int(quotient) == quotient
+        except OverflowError:
+            return (Fraction(instance) / Fraction(dB)).denominator == 1
+    return not instance % dB
+
+
+class _Compiler(object):
+
+    def __init__(self, root, format_checker):
+        self.root = root
+        self.namespace = {
+            "Number": numbers.Number,
+            "keyword_valid": _keyword_valid,
+            "multiple_of": _multiple_of,
+            "conforms": format_checker.conforms,
+        }
+        self.functions = {}  # id(schema) -> function name
+        self.patterns = {}  # regular expression -> search function name
+        self.schemas = []  # keeps compiled schemas alive so their ids stay unique
+        self.lines = []
+
+    def constant(self, value):
+        name = "c%d" % len(self.namespace)
+        self.namespace[name] = value
+        return name
+
+    def search(self, pattern):
+        """ Returns name of the compiled search function of the regular expression """
+        if pattern not in self.patterns:
+            try:
+                self.patterns[pattern] = self.constant(re.compile(pattern).search)
+            except re.error as e:
+                raise SchemaCompilationError("Invalid pattern %r: %s" % (pattern, e))
+        return self.patterns[pattern]
+
+    def resolve(self, ref):
+        if not ref.startswith("#"):
+            raise SchemaCompilationError("Only local references are supported: %s" % ref)
+        schema = self.root
+        pointer = unquote(ref[1:])
+        if not pointer:
+            return schema
+        if not pointer.startswith("/"):
+            raise SchemaCompilationError("Unsupported reference: %s" % ref)
+        for part in pointer[1:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            try:
+                schema = schema[int(part) if isinstance(schema, list) else part]
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                raise SchemaCompilationError("Unresolvable reference: %s" % ref) from e
+        return schema
+
+    def function(self, schema):
+        """ Returns name of the function which validates schema (compiles it if needed) """
+        if id(schema) in self.functions:
+            return self.functions[id(schema)]
+        name = "check_%d" % len(self.functions)
+        self.functions[id(schema)] = name
+        self.schemas.append(schema)
+
+        body = self.body(schema)
+        self.lines.append("def %s(data):" % name)
+        self.lines.extend("    " + line for line in body)
+        self.lines.append("")
+        return name
+
+    def expression(self, schema, var):
+        """ Returns an inline expression for simple schemas and a function call otherwise """
+        if schema is True:
+            return "True"
+        if schema is False:
+            return "False"
+        if not isinstance(schema, dict):
+            raise SchemaCompilationError("Invalid schema: %r" % schema)
+        if "$ref" in schema:
+            return "%s(%s)" % (self.function(self.resolve(schema["$ref"])), var)
+        keywords = set(schema) - ANNOTATIONS
+        if keywords <= {"type", "enum", "const"} and isinstance(schema.get("type", ""), str):
+            conditions = []
+            if "type" in schema:
+                conditions.append(self.type_check(schema["type"], var))
+            if "enum" in schema:
+                conditions.append(self.enum_check(schema["enum"], var))
+            if "const" in schema:
+                conditions.append(self.const_check(schema["const"], var))
+            return " and ".join("(%s)" % e for e in conditions) or "True"
+        return "%s(%s)" % (self.function(schema), var)
+
+    def type_check(self, types, var):
+        if isinstance(types, str):
+            types = [types]
+        checks = []
+        for name in types:
+            if name not in TYPE_CHECKS:
+                raise SchemaCompilationError("Unknown type: %r" % name)
+            checks.append(TYPE_CHECKS[name].format(var))
+        return " or ".join(checks) or "False"
+
+    def enum_check(self, values, var):
+        if all(isinstance(e, str) for e in values):
+            return "isinstance(%s, str) and %s in %s" % (
+                var, var, self.constant(frozenset(values)))
+        return "keyword_valid('enum', %s, %s)" % (self.constant(list(values)), var)
+
+    def const_check(self, value, var):
+        if isinstance(value, str):
+            return "isinstance(%s, str) and %s == %s" % (var, var, self.constant(value))
+        return "keyword_valid('const', %s, %s)" % (self.constant(value), var)
+
+    def body(self, schema):
+        if schema is True:
+            return ["return True"]
+        if schema is False:
+            return ["return False"]
+        if not isinstance(schema, dict):
+            raise SchemaCompilationError("Invalid schema: %r" % schema)
+        if "$ref" in schema:
+            # draft 7 ignores siblings of $ref
+            return ["return %s" % self.expression(schema, "data")]
+        if "$id" in schema and schema is not self.root:
+            raise SchemaCompilationError("Nested $id is not supported")
+
+        lines = []
+
+        def fail_if(condition, indent=""):
+            lines.append("%sif %s:" % (indent, condition))
+            lines.append("%s    return False" % indent)
+
+        if "type" in schema:
+            fail_if("not (%s)" % self.type_check(schema["type"], "data"))
+        if "enum" in schema:
+            fail_if("not (%s)" % self.enum_check(schema["enum"], "data"))
+        if "const" in schema:
+            fail_if("not (%s)" % self.const_check(schema["const"], "data"))
+        if "format" in schema:
+            fail_if("not conforms(data, %r)" % schema["format"])
+
+        lines.extend(self.object_body(schema))
+        lines.extend(self.array_body(schema))
+        lines.extend(self.string_body(schema))
+        lines.extend(self.number_body(schema))
+
+        for subschema in schema.get("allOf", []):
+            fail_if("not (%s)" % self.expression(subschema, "data"))
+        if "anyOf" in schema:
+            fail_if("not (%s)" % " or ".join(
+                "(%s)" % self.expression(e, "data") for e in schema["anyOf"]))
+        if "oneOf" in schema:
+            fail_if("[%s].count(True) != 1" % ", ".join(
+                "bool(%s)" % self.expression(e, "data") for e in schema["oneOf"]))
+        if "not" in schema:
+            fail_if(self.expression(schema["not"], "data"))
+        if "if" in schema:
+            lines.append("if %s:" % self.expression(schema["if"], "data"))
+            if "then" in schema:
+                fail_if("not (%s)" % self.expression(schema["then"], "data"), "    ")
+            else:
+                lines.append("    pass")
+            if "else" in schema:
+                lines.append("else:")
+                fail_if("not (%s)" % self.expression(schema["else"], "data"), "    ")
+
+        lines.append("return True")
+        return lines
+
+    def object_body(self, schema):
+        lines = []
+        properties = schema.get("properties", {})
+        patterns = schema.get("patternProperties", {})
+
+        if "required" in schema:
+            for name in schema["required"]:
+                lines.append("if %s not in data:" % self.constant(name))
+                lines.append("    return False")
+        if "minProperties" in schema:
+            lines.append("if len(data) < %r:" % schema["minProperties"])
+            lines.append("    return False")
+        if "maxProperties" in schema:
+            lines.append("if len(data) > %r:" % schema["maxProperties"])
+            lines.append("    return False")
+        if "properties" in schema:
+            for name, subschema in properties.items():
+                key = self.constant(name)
+                lines.append("if %s in data:" % key)
+                lines.append("    value = data[%s]" % key)
+                lines.append("    if not (%s):" % self.expression(subschema, "value"))
+                lines.append("        return False")
+        if "patternProperties" in schema:
+            lines.append("for key, value in data.items():")
+            for pattern, subschema in patterns.items():
+                lines.append("    if %s(key) and not (%s):" % (
+                    self.search(pattern),
+                    self.expression(subschema, "value")))
+                lines.append("        return False")
+        if "additionalProperties" in schema:
+            additional = schema["additionalProperties"]
+            if additional is not True:
+                condition = "key not in %s" % self.constant(properties)
+                if patterns:
+                    # patterns are not joined, flags, group names and numbers are their own
+                    condition += " and not (%s)" % " or ".join(
+                        "%s(key)" % self.search(pattern) for pattern in patterns)
+                if additional is False:
+                    check = "return False"
+                else:
+                    check = "if not (%s): return False" % self.expression(
+                        additional, "data[key]")
+                lines.append("for key in data:")
+                lines.append("    if %s:" % condition)
+                lines.append("        %s" % check)
+        if "dependencies" in schema:
+            for name, dependency in schema["dependencies"].items():
+                lines.append("if %s in data:" % self.constant(name))
+                if isinstance(dependency, list):
+                    for each in dependency:
+                        lines.append("    if %s not in data:" % self.constant(each))
+                        lines.append("        return False")
+                else:
+                    lines.append("    if not (%s):" % self.expression(dependency, "data"))
+                    lines.append("        return False")
+        if "propertyNames" in schema:
+            lines.append("for key in data:")
+            lines.append("    if not (%s):" % self.expression(schema["propertyNames"], "key"))
+            lines.append("        return False")
+
+        return self.guard("isinstance(data, dict)", lines)
+
+    def array_body(self, schema):
+        lines = []
+        items = schema.get("items", {})
+
+        if "minItems" in schema:
+            lines.append("if len(data) < %r:" % schema["minItems"])
+            lines.append("    return False")
+        if "maxItems" in schema:
+            lines.append("if len(data) > %r:" % schema["maxItems"])
+            lines.append("    return False")
+        if "items" in schema:
+            if isinstance(items, list):
+                for index, subschema in enumerate(items):
+                    lines.append("if len(data) > %d and not (%s):" % (
+                        index, self.expression(subschema, "data[%d]" % index)))
+                    lines.append("    return False")
+            else:
+                lines.append("for item in data:")
+                lines.append("    if not (%s):" % self.expression(items, "item"))
+                lines.append("        return False")
+        if "additionalItems" in schema and isinstance(items, list):
+            additional = schema["additionalItems"]
+            if additional is False:
+                lines.append("if len(data) > %d:" % len(items))
+                lines.append("    return False")
+            elif isinstance(additional, dict):
+                lines.append("for item in data[%d:]:" % len(items))
+                lines.append("    if not (%s):" % self.expression(additional, "item"))
+                lines.append("        return False")
+        if schema.get("uniqueItems"):
+            lines.append("if not keyword_valid('uniqueItems', True, data):")
+            lines.append("    return False")
+        if "contains" in schema:
+            lines.append("if not any(%s for item in data):" % self.expression(
+                schema["contains"], "item"))
+            lines.append("    return False")
+
+        return self.guard("isinstance(data, list)", lines)
+
+    def string_body(self, schema):
+        lines = []
+        if "minLength" in schema:
+            lines.append("if len(data) < %r:" % schema["minLength"])
+            lines.append("    return False")
+        if "maxLength" in schema:
+            lines.append("if len(data) > %r:" % schema["maxLength"])
+            lines.append("    return False")
+        if "pattern" in schema:
+            lines.append("if not %s(data):" % self.search(schema["pattern"]))
+            lines.append("    return False")
+        return self.guard("isinstance(data, str)", lines)
+
+    def number_body(self, schema):
+        lines = []
+        for keyword, operator in (
+            ("minimum", "<"), ("maximum", ">"),
+            ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">="),
+        ):
+            if keyword in schema:
+                lines.append("if data %s %s:" % (operator, self.constant(schema[keyword])))
+                lines.append("    return False")
+        if "multipleOf" in schema:
+            lines.append("if not multiple_of(data, %s):" % self.constant(schema["multipleOf"]))
+            lines.append("    return False")
+        return self.guard(TYPE_CHECKS["number"].format("data"), lines)
+
+    @staticmethod
+    def guard(condition, lines):
+        if not lines:
+            return []
+        return ["if %s:" % condition] + ["    " + line for line in lines]
+
+    def compile(self):
+        name = self.function(self.root)
+        source = "\n".join(self.lines)
+        exec(compile(source, "<foris-schema>", "exec"), self.namespace)
+        compiled = self.namespace[name]
+        compiled.source = source
+        return compiled
+
+
+def compile_schema(schema, format_checker=default_format_checker):
+    """ Compiles a Draft 7 schema into a function returning whether an instance is valid
+
+    :param schema: json schema (local references are resolved against it)
+    :param format_checker: checker used for `format` keyword
+    :raises SchemaCompilationError: when the schema can't be compiled
+    """
+    return _Compiler(schema, format_checker).compile()
@@ -15,44 +15,87 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+""" Format checkers of network related formats
+
+The checkers are called for every field with the format, so they avoid string formatting
+and regex compilation. Results for str values are kept in small LRU caches
+(values which raise are not cached, the exception is raised again).
+"""
+
+import functools
+import ipaddress
 import re
 import socket
-import struct
 
 from jsonschema import FormatChecker
-from jsonschema import _format as existing_checkers
 
 
 MAC_RE = r"^([a-fA-F0-9]{2}:){5}[a-fA-F0-9]{2}$"
 
+# number of cached results per format
+CACHE_SIZE = 1024
+
 format_checker = FormatChecker()
 
+_mac_match = re.compile(MAC_RE).match
+
+# canonical dotted quad (a subset of what ipaddress.IPv4Address accepts)
+_ipv4_fullmatch = re.compile(
+    r"(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}"
+    r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+).fullmatch
+
+
+def _cached(check):
+    """ Caches results of the check for str values """
+    cached_check = functools.lru_cache(maxsize=CACHE_SIZE)(check)
+
+    @functools.wraps(check)
+    def wrapper(value):
+        if type(value) is str:
+            return cached_check(value)
+        return check(value)
+
+    wrapper.cache_clear = cached_check.cache_clear
+    wrapper.cache_info = cached_check.cache_info
+    return wrapper
+
+
+def _is_ipv4(address):
+    # same as jsonschema's ipv4 format check (for str)
+    return _ipv4_fullmatch(address) is not None or bool(ipaddress.IPv4Address(address))
+
+
+def _is_ipv6(address):
+    # same as jsonschema's ipv6 format check (for str)
+    return not getattr(ipaddress.IPv6Address(address), "scope_id", "")
+
 
 @format_checker.checks("ipv4netmask", (socket.error, TypeError))
+@_cached
 def check_ipv4netmask(value):
-    addr = socket.inet_aton(value)
-    addr_int = struct.unpack(">I", addr)[0]
-    bin_repr = "{:032b}".format(addr_int)
-    if "0" in bin_repr.rstrip("0"):
-        return False
-    else:
-        return True
+    # a netmask is ones followed by zeros, so its complement is 2^n - 1
+    inverted = ~int.from_bytes(socket.inet_aton(value), "big") & 0xFFFFFFFF
+    return inverted & (inverted + 1) == 0
 
 
 @format_checker.checks("ipv4prefix", (socket.error, ValueError, AttributeError))
+@_cached
 def check_ipv4prefix(value):
     address, prefix = value.rsplit("/", 1)
     prefix_num = int(prefix)
-    return existing_checkers.is_ipv4(address) and 0 <= prefix_num and prefix_num <= 32
+    return _is_ipv4(address) and 0 <= prefix_num <= 32
 
 
 @format_checker.checks("ipv6prefix", (socket.error, ValueError, AttributeError))
+@_cached
 def check_ipv6prefix(value):
     address, prefix = value.rsplit("/", 1)
     prefix_num = int(prefix)
-    return existing_checkers.is_ipv6(address) and 0 <= prefix_num and prefix_num <= 128
+    return _is_ipv6(address) and 0 <= prefix_num <= 128
 
 
 @format_checker.checks("macaddress", (ValueError, TypeError))
+@_cached
 def check_macaddress(value):
-    return True if re.match(MAC_RE, value) else False
+    return _mac_match(value) is not None
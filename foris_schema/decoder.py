@@ -0,0 +1,189 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Json decoders used to read schema files, the schema cache and messages of the CLI
+
+A decoder has loads(data) which accepts str or bytes and load_file(path).
+Bytes and files are decoded as strict UTF-8 (unlike json.loads(), a BOM or UTF-16
+and UTF-32 are not accepted). Invalid documents raise json.JSONDecodeError
+(or UnicodeDecodeError for undecodable bytes) exactly as the json module does,
+so callers handle all decoders the same way.
+
+When orjson is installed, it is used by default. Documents which orjson rejects
+(e.g. NaN or lone surrogates which the json module accepts) are decoded by the json
+module again, so the results and errors don't depend on the decoder. orjson turns
+integers over 64 bits into floats, so documents containing such long numbers
+are decoded by the json module as well.
+"""
+
+import json
+import re
+
+from json.decoder import scanstring
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# digits are replaced by "0" and everything else by " ", then 19 zeros in a row mean
+# a number which may not fit into 64 bits (or a string which looks like it)
+_DIGITS_TABLE = bytes(ord("0") if chr(i).isdigit() and i < 128 else ord(" ") for i in range(256))
+_LONG_NUMBER = b"0" * 19
+
+_whitespace = re.compile(r"[ \t\n\r]*").match
+_scan_value = json.JSONDecoder().scan_once
+# \u escape of an ASCII character other than a control one (it may hide a member name)
+_ESCAPED_ASCII = re.compile(r"\\u00[2-7][0-9a-fA-F]")
+_ESCAPED_ASCII_BYTES = re.compile(_ESCAPED_ASCII.pattern.encode())
+
+
+def _has_long_number(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return _LONG_NUMBER in data.translate(_DIGITS_TABLE)
+
+
+def _text(data):
+    """ Decodes bytes as strict UTF-8 (json.loads() would detect other encodings) """
+    return data if isinstance(data, str) else str(data, "utf-8")
+
+
+class JsonDecoder(object):
+    """ Decoder which uses the json module """
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(_text(data))
+
+    def load_file(self, path):
+        with open(path, "rb") as f:
+            return self.loads(f.read())
+
+    def __repr__(self):
+        return "<%s %s>" % (type(self).__name__, self.name)
+
+
+class OrjsonDecoder(JsonDecoder):
+    """ Decoder which uses orjson and falls back to the json module on errors """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+
+    def loads(self, data):
+        if _has_long_number(data):
+            return json.loads(_text(data))
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(_text(data))  # accepts more or raises the usual error
+
+
+DECODERS = {
+    JsonDecoder.name: JsonDecoder,
+    OrjsonDecoder.name: OrjsonDecoder,
+}
+
+
+def available_decoders():
+    """ Returns names of decoders which can be used """
+    return [name for name in DECODERS if name != OrjsonDecoder.name or orjson is not None]
+
+
+def get_decoder(decoder=None):
+    """ Returns decoder instance
+
+    :param decoder: name of the decoder, decoder instance or None for the fastest
+                    installed decoder
+    :raises ValueError: when the decoder is unknown or not installed
+    """
+    if decoder is None:
+        decoder = OrjsonDecoder.name if orjson is not None else JsonDecoder.name
+    if not isinstance(decoder, str):
+        return decoder
+    if decoder not in DECODERS:
+        raise ValueError("Unknown json decoder %r (available: %s)" % (
+            decoder, ", ".join(available_decoders())))
+    return DECODERS[decoder]()
+
+
+def leading_members(payload, names, limit=1024):
+    """ Decodes leading members of the json object in the payload without decoding the rest
+
+    Members are decoded while their names are in names, the first other member stops
+    the scan (its value is not decoded). Only the first limit bytes are examined.
+    The payload itself is not checked, it may still be invalid json.
+
+    :param payload: str or bytes
+    :returns: {name: value} (the last value of repeated names) or None when the payload
+              doesn't start with a json object
+    """
+    head = payload[:limit]
+    if not isinstance(head, str):
+        # invalid utf-8 makes the whole payload invalid, so it may be ignored here
+        head = bytes(head).decode("utf-8", "ignore")
+
+    idx = _whitespace(head, 0).end()
+    if head[idx:idx + 1] != "{":
+        return None
+    members = {}
+    idx += 1
+    while True:
+        idx = _whitespace(head, idx).end()
+        if head[idx:idx + 1] != '"':
+            break
+        try:
+            name, idx = scanstring(head, idx + 1)
+        except ValueError:
+            break
+        if name not in names:
+            break
+        idx = _whitespace(head, idx).end()
+        if head[idx:idx + 1] != ":":
+            break
+        idx = _whitespace(head, idx + 1).end()
+        try:
+            value, idx = _scan_value(head, idx)
+        except (StopIteration, ValueError):
+            break
+        members[name] = value
+        idx = _whitespace(head, idx).end()
+        if head[idx:idx + 1] != ",":
+            break
+        idx += 1
+    return members
+
+
+def unique_members(payload, names):
+    """ Returns whether none of the names can be repeated in the json object in the payload
+
+    Values of leading_members() are the final values (json decoders keep the last value
+    of a repeated name) when this is true. Each name may occur in the payload only once
+    as a string and no string may contain escaped ASCII characters.
+
+    :param payload: str or bytes
+    """
+    if isinstance(payload, str):
+        if "\\" in payload and _ESCAPED_ASCII.search(payload):
+            return False
+        return all(payload.count('"%s"' % name) <= 1 for name in names)
+    if b"\\" in payload and _ESCAPED_ASCII_BYTES.search(payload):
+        return False
+    return all(payload.count(b'"%s"' % name.encode()) <= 1 for name in names)
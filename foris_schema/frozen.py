@@ -0,0 +1,114 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Read-only schemas
+
+Loaded schemas are shared by validators, caches and callers, so they are frozen
+instead of being copied for each caller. Frozen containers are still dict and list
+instances, so jsonschema, json and the compiler work with them as before.
+copy.deepcopy() returns a mutable (plain) copy.
+"""
+
+import json
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("%s is read-only" % type(self).__name__)
+
+
+class FrozenDict(dict):
+    """ dict which can't be modified """
+
+    __slots__ = ("_json", )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self, memo)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self), ))
+
+    def to_json(self):
+        """ Returns json representation (it is serialized only once) """
+        try:
+            return self._json
+        except AttributeError:
+            self._json = json.dumps(self)
+            return self._json
+
+
+class FrozenList(list):
+    """ list which can't be modified """
+
+    __slots__ = ("_json", )
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = clear = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    __deepcopy__ = FrozenDict.__deepcopy__
+
+    def __reduce__(self):
+        return (FrozenList, (list(self), ))
+
+    to_json = FrozenDict.to_json
+
+
+def _thaw(value, memo):
+    """ Returns mutable deep copy of the (possibly frozen) json-like value """
+    if not isinstance(value, (dict, list)):
+        return value
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, dict):
+        result = memo[id(value)] = {}
+        for key, item in value.items():
+            result[key] = _thaw(item, memo)
+    else:
+        result = memo[id(value)] = []
+        for item in value:
+            result.append(_thaw(item, memo))
+    return result
+
+
+def freeze(value, memo=None):
+    """ Returns read-only version of the json-like value
+
+    Objects which are shared within the value (or between values frozen with the same memo)
+    are still shared in the result. Already frozen parts are used as they are.
+
+    :param memo: {id(original): frozen} shared by multiple calls
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(value, (FrozenDict, FrozenList)) or not isinstance(value, (dict, list)):
+        return value
+    frozen = memo.get(id(value))
+    if frozen is not None:
+        return frozen
+    if isinstance(value, dict):
+        frozen = FrozenDict((key, freeze(item, memo)) for key, item in value.items())
+    else:
+        frozen = FrozenList(freeze(item, memo) for item in value)
+    memo[id(value)] = frozen
+    return frozen
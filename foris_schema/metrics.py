@@ -0,0 +1,108 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Validation counters and timings """
+
+import bisect
+import threading
+
+# upper bounds of histogram buckets (seconds), the last bucket is unbounded
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+OUTCOMES = ("valid", "invalid", "error")
+
+
+class ValidationMetrics(object):
+    """ Collects counts and timings of validations per (module, kind, action)
+
+    Outcomes are "valid", "invalid" and "error" (an error message which was let through).
+    The time spent in the verbose error path of validate() (full jsonschema validation
+    of messages which didn't pass the first check) is recorded separately as "verbose".
+
+    Callbacks are called as callback(key, event, duration) where event is one of the
+    outcomes or "verbose". They are called in the validating thread, so they should be quick.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, callbacks=()):
+        """
+        :param buckets: sorted upper bounds of histogram buckets in seconds
+        :param callbacks: functions called for each recorded event
+        """
+        self.buckets = tuple(buckets)
+        self.callbacks = list(callbacks)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, key):
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = {
+                "valid": 0,
+                "invalid": 0,
+                "error": 0,
+                "time": 0.0,
+                "histogram": [0] * (len(self.buckets) + 1),
+                "verbose_count": 0,
+                "verbose_time": 0.0,
+            }
+        return entry
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def record(self, key, outcome, duration):
+        """ Records a single validation
+
+        :param key: (module, kind, action) tuple
+        :param outcome: "valid", "invalid" or "error"
+        :param duration: validation time in seconds
+        """
+        with self._lock:
+            entry = self._entry(key)
+            entry[outcome] += 1
+            entry["time"] += duration
+            entry["histogram"][bisect.bisect_left(self.buckets, duration)] += 1
+        for callback in self.callbacks:
+            callback(key, outcome, duration)
+
+    def record_verbose(self, key, duration):
+        """ Records time spent in the verbose error path """
+        with self._lock:
+            entry = self._entry(key)
+            entry["verbose_count"] += 1
+            entry["verbose_time"] += duration
+        for callback in self.callbacks:
+            callback(key, "verbose", duration)
+
+    def snapshot(self):
+        """ Returns a copy of collected metrics
+
+        :returns: {(module, kind, action): {"valid": ..., "invalid": ..., "error": ...,
+                   "time": ..., "histogram": [...], "verbose_count": ..., "verbose_time": ...}}
+                  histogram[i] counts validations which took at most buckets[i] seconds
+                  (and more than buckets[i - 1]), the last item counts the slower ones
+        """
+        with self._lock:
+            return {
+                key: dict(entry, histogram=list(entry["histogram"]))
+                for key, entry in self._stats.items()
+            }
+
+    def reset(self):
+        """ Clears collected metrics and returns their last snapshot """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
@@ -0,0 +1,97 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Validation of large amounts of messages in multiple processes """
+
+import itertools
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .validator import ForisValidator, _portable_error
+
+
+_validator = None  # validator of the worker process
+
+
+def _init_worker(schema_paths, definitions_paths, kwargs):
+    global _validator
+    _validator = ForisValidator(schema_paths, definitions_paths, **kwargs)
+
+
+def _validate_chunk(messages, errors):
+    return [
+        r._replace(error=_portable_error(r.error)) if r.error is not None else r
+        for r in _validator.validate_many(messages, errors)
+    ]
+
+
+class ForisValidatorPool(object):
+    """ Validates messages using ForisValidator instances in worker processes
+
+    Every worker builds its own validator once when it starts. Messages are sent
+    to the workers in chunks and results are returned in the original order.
+    """
+
+    def __init__(
+        self, schema_paths, definitions_paths=[], workers=None, chunk_size=512, **kwargs
+    ):
+        """
+        :param schema_paths: directories containing module schemas
+        :param definitions_paths: directories containing global definitions
+        :param workers: number of worker processes (defaults to number of CPUs)
+        :param chunk_size: number of messages sent to a worker at once
+        :param kwargs: other ForisValidator arguments (e.g. compiled=True)
+        """
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(list(schema_paths), list(definitions_paths), kwargs),
+        )
+
+    def iter_validate(self, messages, errors=True):
+        """ Yields ValidationResult for each message (in order)
+
+        Only a limited number of chunks is being processed at the same time,
+        so that the input can be an arbitrarily long iterable.
+        """
+        iterator = iter(messages)
+        pending = deque()
+        while True:
+            while len(pending) < 2 * self.workers:
+                chunk = list(itertools.islice(iterator, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self.executor.submit(_validate_chunk, chunk, errors))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def validate_many(self, messages, errors=True):
+        """ Returns list of ValidationResult (in the same order as messages) """
+        return list(self.iter_validate(messages, errors))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
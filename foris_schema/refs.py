@@ -0,0 +1,219 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Resolution of $ref to definitions during schema loading
+
+Module schemas refer to definitions only by "#/definitions/<name>". Such references
+can be resolved once when the schema is loaded instead of on every validation.
+Nested "$id" would change the resolution scope, so schemas containing it are left as they are.
+"""
+
+from urllib.parse import unquote
+
+from jsonschema import Draft7Validator, validators
+
+DEFINITIONS_PREFIX = "#/definitions/"
+
+# keywords whose values are schemas, lists of schemas and dicts of schemas
+_SCHEMA_KEYWORDS = (
+    "additionalItems", "additionalProperties", "contains", "else", "if", "not",
+    "propertyNames", "then",
+)
+_LIST_KEYWORDS = ("allOf", "anyOf", "oneOf")
+_DICT_KEYWORDS = ("definitions", "patternProperties", "properties")
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def definition_name(ref):
+    """ Returns name of the definition referenced by "#/definitions/<name>" or None """
+    if not isinstance(ref, str) or not ref.startswith(DEFINITIONS_PREFIX):
+        return None
+    name = unquote(ref[len(DEFINITIONS_PREFIX):])
+    if "/" in name:
+        return None  # points inside a definition
+    return name.replace("~1", "/").replace("~0", "~")
+
+
+def _contains_id(schema):
+    stack = [schema]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "$id" in item:
+                return True
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
+
+def referenced_definitions(schema, definitions=None):
+    """ Returns names of definitions used by the schema (even indirectly)
+
+    References are looked up in the schema's own definitions first and then in definitions.
+
+    :returns: set of names or None when it can't be determined (other than local
+              references or "$id" are used)
+    """
+    local_definitions = schema.get("definitions", {})
+    definitions = definitions or {}
+    names = set()
+    stack = [v for k, v in schema.items() if k != "definitions"]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "$id" in item:
+                return None
+            ref = item.get("$ref")
+            if isinstance(ref, str):
+                if ref.startswith(DEFINITIONS_PREFIX):
+                    name = unquote(ref[len(DEFINITIONS_PREFIX):].split("/")[0])
+                    name = name.replace("~1", "/").replace("~0", "~")
+                    if name not in names:
+                        names.add(name)
+                        if name in local_definitions:
+                            stack.append(local_definitions[name])
+                        elif name in definitions:
+                            stack.append(definitions[name])
+                elif not ref.startswith("#") or ref.startswith("#/definitions"):
+                    return None  # remote reference or the whole definitions
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return names
+
+
+def resolve_refs(schema):
+    """ Returns {ref: definition} for all references to definitions used in the schema """
+    if not isinstance(schema, dict) or _contains_id(schema):
+        return {}
+    definitions = schema.get("definitions", {})
+    resolved = {}
+    stack = [schema]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            ref = item.get("$ref")
+            name = definition_name(ref)
+            if name is not None and name in definitions:
+                resolved[ref] = definitions[name]
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return resolved
+
+
+# "$ref" keyword of Draft7Validator, used for references which were not resolved in advance
+_draft7_ref = Draft7Validator.VALIDATORS["$ref"]
+
+
+def validator_class(schema):
+    """ Returns Draft7Validator subclass where references of the schema are already resolved
+
+    Validation errors are the same as errors of Draft7Validator, only the lookup
+    of the referenced schema is skipped. Unknown references are resolved as usual.
+    """
+    resolved = resolve_refs(schema)
+    if not resolved:
+        return Draft7Validator
+
+    def ref(validator, ref, instance, schema):
+        target = resolved.get(ref)
+        if target is None:
+            yield from _draft7_ref(validator, ref, instance, schema)
+        else:
+            yield from validator.descend(instance, target)
+
+    return validators.extend(Draft7Validator, {"$ref": ref})
+
+
+def inline_refs(schema):
+    """ Returns a copy of the schema with references to definitions replaced by the definitions
+
+    Recursive references are kept (together with the definitions they need).
+    Each definition is copied only once and shared by all places where it is used.
+    The result is meant for is_valid() only: paths of validation errors would be the same,
+    but the schemas in error messages would contain the inlined definitions.
+
+    :returns: new schema or None when the schema can't be inlined safely
+    """
+    if not isinstance(schema, dict) or _contains_id(schema):
+        return None
+    definitions = schema.get("definitions", {})
+    inlined = {}  # name -> inlined definition
+    in_progress = set()
+    recursive = set()
+
+    def inline_definition(name):
+        if name in inlined:
+            return inlined[name]
+        if name in in_progress:
+            recursive.add(name)
+            return None
+        in_progress.add(name)
+        result = walk(definitions[name])
+        in_progress.discard(name)
+        inlined[name] = result
+        return result
+
+    def walk(item):
+        if not isinstance(item, dict):
+            return item  # boolean schema
+        if "$ref" in item:
+            name = definition_name(item["$ref"])
+            if name is None:
+                raise _Unsupported()
+            if name not in definitions:
+                return item  # fails the same way as before
+            target = inline_definition(name)
+            return item if target is None else target
+
+        result = dict(item)
+        for keyword in _SCHEMA_KEYWORDS:
+            if keyword in item:
+                result[keyword] = walk(item[keyword])
+        for keyword in _LIST_KEYWORDS:
+            if isinstance(item.get(keyword), list):
+                result[keyword] = [walk(e) for e in item[keyword]]
+        for keyword in _DICT_KEYWORDS:
+            if keyword == "definitions" and item is schema:
+                continue  # top-level definitions are inlined where they are used
+            if isinstance(item.get(keyword), dict):
+                result[keyword] = {k: walk(v) for k, v in item[keyword].items()}
+        if "items" in item:
+            items = item["items"]
+            result["items"] = [walk(e) for e in items] if isinstance(items, list) \
+                else walk(items)
+        if isinstance(item.get("dependencies"), dict):
+            result["dependencies"] = {
+                k: walk(v) if isinstance(v, dict) else v
+                for k, v in item["dependencies"].items()
+            }
+        return result
+
+    try:
+        result = walk(schema)
+    except _Unsupported:
+        return None
+
+    result.pop("definitions", None)
+    if recursive:
+        # recursive references are resolved within the kept definitions
+        result["definitions"] = {name: inlined[name] for name in sorted(recursive)}
+    return result
@@ -0,0 +1,157 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Validation of a sample of messages """
+
+import logging
+import random
+import threading
+
+from jsonschema import ValidationError
+
+from .validator import _message_key
+
+logger = logging.getLogger(__name__)
+
+
+class SampledValidator(object):
+    """ Fully validates only a part of messages
+
+    The envelope (module, kind, action, data and errors) of every message is checked,
+    the rest of the message is validated only with the probability given by the rate
+    of its module and kind. When a sampled message fails, all following messages
+    with the same (module, action) are validated fully (the key is escalated).
+    """
+
+    def __init__(self, validator, rate=1.0, rates=None, seed=None, on_escalate=None):
+        """
+        :param validator: ForisValidator instance
+        :param rate: probability that a message is fully validated
+        :param rates: rates which override the default rate, keys are (module, kind),
+                      module name or (None, kind) and they are used in this order
+        :param seed: seed of the random generator (for reproducible sampling)
+        :param on_escalate: called with (module, action) and the ValidationError when
+                            the key is escalated
+        """
+        self.validator = validator
+        self.rate = rate
+        self.rates = dict(rates or {})
+        for value in [rate, *self.rates.values()]:
+            if not 0.0 <= value <= 1.0:
+                raise ValueError("Sampling rate %r is not between 0 and 1" % value)
+        self.on_escalate = on_escalate
+        self._random = random.Random(seed).random
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._escalated = set()
+
+    def get_rate(self, module, kind):
+        """ Returns the sampling rate of messages of the module and kind """
+        for key in ((module, kind), module, (None, kind)):
+            rate = self.rates.get(key)
+            if rate is not None:
+                return rate
+        return self.rate
+
+    def _count(self, key, counter):
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {"checked": 0, "skipped": 0, "failed": 0}
+            entry[counter] += 1
+
+    def _sampled(self, msg):
+        """ Returns whether the message with a valid envelope should be fully validated """
+        if (msg["module"], msg["action"]) in self._escalated:
+            return True
+        rate = self.get_rate(msg["module"], msg["kind"])
+        return rate >= 1.0 or rate > 0.0 and self._random() < rate
+
+    def _escalate(self, msg, error):
+        key = (msg["module"], msg["action"])
+        with self._lock:
+            if key in self._escalated:
+                return
+            self._escalated.add(key)
+        logger.warning("Sampled message %s failed, validating all of them: %s", key, error)
+        if self.on_escalate:
+            self.on_escalate(key, error)
+
+    def validate(self, msg):
+        """ Same as ForisValidator.validate(), but only the envelope of skipped messages is
+        validated
+
+        :raises ValidationError: when the envelope or a sampled message is not valid
+        """
+        if not self.validator.envelope_check(msg):
+            self._count(_message_key(msg), "failed")
+            self.validator.base_validator.validate(msg)  # raises the detailed error
+        key = (msg["module"], msg["kind"], msg["action"])
+        if not self._sampled(msg):
+            self._count(key, "skipped")
+            return
+        try:
+            self.validator.validate(msg)
+        except ValidationError as e:
+            self._count(key, "failed")
+            self._escalate(msg, e)
+            raise
+        self._count(key, "checked")
+
+    def is_valid(self, msg):
+        """ Same as ForisValidator.is_valid(), skipped messages are valid when their envelope
+        is valid
+        """
+        if not self.validator.envelope_check(msg):
+            self._count(_message_key(msg), "failed")
+            return False
+        key = (msg["module"], msg["kind"], msg["action"])
+        if not self._sampled(msg):
+            self._count(key, "skipped")
+            return True
+        if self.validator.is_valid(msg):
+            self._count(key, "checked")
+            return True
+        self._count(key, "failed")
+        if (msg["module"], msg["action"]) not in self._escalated:
+            try:
+                self.validator.validate(msg)  # to get the error
+            except ValidationError as e:
+                self._escalate(msg, e)
+        return False
+
+    @property
+    def escalated(self):
+        """ (module, action) keys which are always fully validated """
+        with self._lock:
+            return set(self._escalated)
+
+    def reset_escalation(self, key=None):
+        """ Returns the key (or all keys when None) to sampling """
+        with self._lock:
+            if key is None:
+                self._escalated.clear()
+            else:
+                self._escalated.discard(key)
+
+    def stats(self):
+        """ Returns {(module, kind, action): {"checked": ..., "skipped": ..., "failed": ...}}
+
+        "failed" counts messages with an invalid envelope as well as sampled messages
+        which failed (they are not counted as "checked").
+        """
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._stats.items()}
@@ -15,14 +15,27 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import copy
-import json
+import itertools
+import logging
 import os
+import threading
+import time
 
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from json.decoder import JSONDecodeError
 
-from jsonschema import validate as schema_validate, Draft7Validator, ValidationError
+from jsonschema import validate as schema_validate, Draft7Validator, SchemaError, ValidationError
+from jsonschema.exceptions import best_match
+from .bundle import Bundle, StaleBundleError
+from .cache import ResultCache, SchemaCache, file_digest
+from . import refs
+from .compiler import compile_schema, SchemaCompilationError
+from .decoder import get_decoder, leading_members, unique_members
+from .frozen import freeze
 from .custom_format_checkers import format_checker
 
+logger = logging.getLogger(__name__)
 
 BASE_SCHEMA = {
     "$schema": "http://turris.cz/foris-schema-base#",
@@ -123,6 +136,36 @@ SCHEMA_FOR_SCHEMAS = {
 }
 
 
+# Result of batch validation
+# valid - whether the message passed the validation
+# error_message - message passed only because it is a valid error message
+# error - the most relevant ValidationError of an invalid message (None otherwise)
+ValidationResult = namedtuple("ValidationResult", ["valid", "error_message", "error"])
+RESULT_VALID = ValidationResult(True, False, None)
+RESULT_ERROR_MESSAGE = ValidationResult(True, True, None)
+RESULT_INVALID = ValidationResult(False, False, None)
+
+
+ENVELOPE_KEYS = frozenset(("module", "kind", "action"))
+
+
+def _outcome(result):
+    """ Returns metrics outcome of ValidationResult """
+    if not result.valid:
+        return "invalid"
+    return "error" if result.error_message else "valid"
+
+
+def _message_key(msg):
+    """ Returns (module, kind, action) even for malformed messages """
+    if not isinstance(msg, dict):
+        return (None, None, None)
+    return tuple(
+        value if isinstance(value, str) else None
+        for value in (msg.get("module"), msg.get("kind"), msg.get("action"))
+    )
+
+
 class ModuleAlreadyLoaded(Exception):
     pass
 
@@ -143,6 +186,37 @@ class ForisValidationError(Exception):
     pass
 
 
+class _ValidatorState(object):
+    """ Loaded schemas and validators
+
+    ForisValidator.reload() builds a new state and replaces the old one at once,
+    so a validation which started with the old state finishes with it.
+    """
+
+    def __init__(self, definitions, sources, definition_files, module_files):
+        """
+        :param definitions: global definitions
+        :param sources: {path: (mtime_ns, size)} of all source files
+        :param definition_files: set of paths of definition files
+        :param module_files: {module_name: path}
+        """
+        self.definitions = definitions
+        self.sources = sources
+        self.definition_files = definition_files
+        self.module_files = module_files
+        self.validators = {}
+        self.action_validators = {}
+        self.action_checks = {}
+        self.module_actions = {}  # module_name -> keys of its action validators
+        self.pending_modules = {}  # module_name -> file path or already verified schema
+        self.base_validator = None
+        self.envelope_check = None
+
+    def set_modules(self, module_names):
+        self.base_validator = ForisValidator._prepare_base_validator(module_names)
+        self.envelope_check = ForisValidator._prepare_envelope_check(module_names)
+
+
 class ForisValidator(object):
 
     @staticmethod
@@ -153,28 +227,90 @@ class ForisValidator(object):
         ]
 
     @staticmethod
-    def _load_definitions(definitions, file_path):
-        with open(file_path) as f:
-            try:
-                schema = json.load(f)
-            except JSONDecodeError as e:
-                raise ForisValidationError(
-                    "Error loading file {}, reason: {!r}".format(file_path, e)
-                ) from e
-            Draft7Validator.check_schema(schema)
-            for new_definition, data in schema["definitions"].items():
-                if new_definition in definitions:
-                    raise SchemaErrorDefinitionAlreadyUsed(new_definition)
-                definitions[new_definition] = data
+    def _load_definitions(definitions, file_path, decoder=None):
+        try:
+            schema = get_decoder(decoder).load_file(file_path)
+        except JSONDecodeError as e:
+            raise ForisValidationError(
+                "Error loading file {}, reason: {!r}".format(file_path, e)
+            ) from e
+        Draft7Validator.check_schema(schema)
+        for new_definition, data in schema["definitions"].items():
+            if new_definition in definitions:
+                raise SchemaErrorDefinitionAlreadyUsed(new_definition)
+            definitions[new_definition] = data
 
     @staticmethod
     def _prepare_base_validator(modules_list):
         schema = copy.deepcopy(BASE_SCHEMA)
         schema["properties"]["module"]["enum"] = [e for e in modules_list]
-        return Draft7Validator(schema, format_checker=format_checker)
+        return Draft7Validator(freeze(schema), format_checker=format_checker)
+
+    @staticmethod
+    def _prepare_envelope_check(modules_list):
+        """ Returns a function which gives the same result as is_valid() of the base validator
+
+        It only checks the few top-level keys of BASE_SCHEMA directly, the base validator
+        is still used to produce the ValidationError.
+        """
+        properties = BASE_SCHEMA["properties"]
+        allowed = frozenset(properties)
+        kinds = frozenset(properties["kind"]["enum"])
+        modules = frozenset(modules_list)
+
+        def check(msg):
+            if not isinstance(msg, dict) or not msg.keys() <= allowed:
+                return False
+            kind = msg.get("kind")
+            module = msg.get("module")
+            if not (
+                isinstance(kind, str) and kind in kinds
+                and isinstance(module, str) and module in modules
+                and isinstance(msg.get("action"), str)
+            ):
+                return False
+            if "data" in msg and not isinstance(msg["data"], dict):
+                return False
+            if "errors" in msg and not isinstance(msg["errors"], list):
+                return False
+            return True
+
+        return check
+
+    @staticmethod
+    def _load_module(module_name, file_path, definitions, decoder=None):
+        """ Loads module schema, fills in global definitions and verifies it """
+        try:
+            schema = get_decoder(decoder).load_file(file_path)
+        except JSONDecodeError as e:
+            raise ForisSchemaValidationError(
+                "Validation of json schema {} failed. Reason: {!r}".format(file_path, e)
+            ) from e
+
+        # fill-in global definitions (local definitions are not overriden)
+        ForisValidator._merge_definitions(schema, definitions)
+
+        Draft7Validator.check_schema(schema)
+
+        ForisValidator._verify_module_schema(module_name, schema)
+        return schema
+
+    @staticmethod
+    def _merge_definitions(schema, definitions, names=None):
+        """ Adds global definitions used by the module schema to its definitions
+
+        :param names: names of the global definitions to add (found in the schema by default)
+        """
+        local_definitions = schema.get("definitions", {})
+        if names is None:
+            names = refs.referenced_definitions(schema, definitions)
+        for name, definition in definitions.items():
+            if name not in local_definitions and (names is None or name in names):
+                local_definitions[name] = definition
+        schema["definitions"] = local_definitions
 
     @staticmethod
-    def _prepare_validator(module_name, schema):
+    def _verify_module_schema(module_name, schema):
         schema["$schema"] = "http://turris.cz/foris-schema-modules-%s#" % module_name
 
         # custom schema_for_schemas to validate module name as well
@@ -193,103 +329,732 @@ class ForisValidator(object):
         # Now check for unique combination (module, kind, action)
         used = set()
         for e in schema["oneOf"]:
-            item = (
-                e["properties"]["module"]["enum"][0],
-                e["properties"]["kind"]["enum"][0],
-                e["properties"]["action"]["enum"][0],
-            )
+            item = ForisValidator._branch_key(e)
             if item in used:
                 raise SchemaErrorMutipleTypes(item)
             used.add(item)
 
-        return Draft7Validator(schema, format_checker=format_checker)
+    @staticmethod
+    def _branch_key(branch):
+        return (
+            branch["properties"]["module"]["enum"][0],
+            branch["properties"]["kind"]["enum"][0],
+            branch["properties"]["action"]["enum"][0],
+        )
+
+    @staticmethod
+    def _prepare_validator(schema):
+        validator_class = refs.validator_class(schema)
+        action_validators = {
+            ForisValidator._branch_key(e): ForisValidator._prepare_action_validator(
+                schema, e, validator_class)
+            for e in schema["oneOf"]
+        }
+        return validator_class(schema, format_checker=format_checker), action_validators
+
+    @staticmethod
+    def _prepare_action_validator(schema, branch, validator_class=Draft7Validator):
+        """ Validator for a single branch of module's oneOf
+
+        Branches are distinguished by unique (module, kind, action), so a message
+        is valid against the whole module schema iff it is valid against its branch.
+        """
+        mini_schema = {
+            "$schema": schema["$schema"],
+            "definitions": schema["definitions"],
+        }
+        for k, v in branch.items():
+            mini_schema[k] = v
+        return validator_class(freeze(mini_schema), format_checker=format_checker)
+
+    @staticmethod
+    def _prepare_action_check(validator, compiled):
+        """ Function which only tells whether the message is valid against the branch """
+        if compiled:
+            try:
+                return compile_schema(validator.schema, format_checker=format_checker)
+            except SchemaCompilationError:
+                pass  # fallback to interpreted validation
+        inlined = refs.inline_refs(validator.schema)
+        if inlined is None:
+            return validator.is_valid
+        return type(validator)(inlined, format_checker=format_checker).is_valid
+
+    @staticmethod
+    def _prepare_error_check(error_validator):
+        """ Function which tells whether the message is a valid error message """
+        try:
+            return compile_schema(error_validator.schema, format_checker=format_checker)
+        except SchemaCompilationError:
+            return error_validator.is_valid
 
     @property
     def base_schema(self):
-        return copy.deepcopy(self.base_validator.schema)
+        """ Read-only base schema (use copy.deepcopy() to get a mutable copy) """
+        return self.base_validator.schema
 
     @property
     def error_schema(self):
-        return copy.deepcopy(self.error_validator.schema)
+        """ Read-only error schema (use copy.deepcopy() to get a mutable copy) """
+        return self.error_validator.schema
 
     def get_module_schema(self, module_name):
-        return self.validators[module_name].schema
+        """ Returns read-only schema of the module (use copy.deepcopy() to get a mutable copy) """
+        state = self._state
+        if module_name in state.pending_modules:
+            self._load_pending_module(state, module_name)
+        return state.validators[module_name].schema
 
-    def __init__(self, schema_paths, definitions_paths=[]):
-        self.definitions = {}
-        self.validators = {}
+    @property
+    def definitions(self):
+        return self._state.definitions
+
+    @property
+    def validators(self):
+        return self._state.validators
+
+    @property
+    def action_validators(self):
+        return self._state.action_validators
+
+    @property
+    def action_checks(self):
+        return self._state.action_checks
+
+    @property
+    def base_validator(self):
+        return self._state.base_validator
+
+    @property
+    def envelope_check(self):
+        return self._state.envelope_check
+
+    def __init__(
+        self, schema_paths, definitions_paths=[], compiled=False, cache_dir=None, lazy=False,
+        result_cache_size=0, metrics=None, load_workers=0, decoder=None, bundle=None,
+    ):
+        """
+        :param schema_paths: directories containing module schemas
+        :param definitions_paths: directories containing global definitions
+        :param compiled: compile module schemas into python functions to speed up validation
+        :param cache_dir: directory where loaded and verified schemas are cached between runs
+        :param lazy: only module names are read during initialization, module schemas are
+                     loaded and verified when the module is used for the first time
+                     (the cache is used when present, but it is not written in lazy mode)
+        :param result_cache_size: number of validation results of recent messages kept
+                                  in memory (0 disables the cache)
+        :param metrics: ValidationMetrics instance which collects counts and timings
+                        of validations (results served from the result cache are not recorded)
+        :param load_workers: number of processes which read and verify module schemas
+                             during initialization (0 means in this process); the raised
+                             error is the same as with sequential loading
+        :param decoder: json decoder of schema files, its name ("json", "orjson") or None
+                        for the fastest installed one (see foris_schema.decoder)
+        :param bundle: loaded Bundle whose schemas are used instead of the files
+                       (see from_bundle())
+        """
+        self.schema_paths = list(schema_paths)
+        self.definitions_paths = list(definitions_paths)
+        self.compiled = compiled
+        self.lazy = lazy
+        self.decoder = get_decoder(decoder)
+        self._lock = threading.Lock()
+        self._result_cache = ResultCache(result_cache_size) if result_cache_size > 0 else None
+        self.metrics = metrics
+        if metrics is not None:
+            # bound here so there is no overhead when the metrics are disabled
+            self._validate = self._measured_validate
+            self._is_valid = self._measured_is_valid
+
+        if bundle is not None:
+            # files as they were when the bundle was built, reload() loads the changed ones
+            definition_files = bundle.definition_files
+            sources = bundle.sources
+            module_files = bundle.module_files
+        else:
+            # files are checked before loading, so changes made during loading are reloaded
+            definition_files = ForisValidator._source_files([], definitions_paths)
+            sources = ForisValidator._stat_files(
+                ForisValidator._source_files(schema_paths, definitions_paths))
+            module_files = None
+
+        cache = None
+        if cache_dir and bundle is None:
+            cache = SchemaCache(
+                cache_dir,
+                ForisValidator._source_files(schema_paths, definitions_paths),
+                (
+                    [os.path.abspath(e) for e in schema_paths],
+                    [os.path.abspath(e) for e in definitions_paths],
+                ),
+                self.decoder,
+            )
+        cached = cache.load() if cache else None
+        if bundle is not None:
+            cached = bundle.definitions, bundle.modules
+        if cached:
+            definitions, modules = cached
+            # keep global definitions shared by the module schemas
+            memo = {}
+            definitions = freeze(definitions, memo)
+            modules = {name: freeze(schema, memo) for name, schema in modules.items()}
+        elif lazy:
+            definitions = ForisValidator._load_all_definitions(definitions_paths, self.decoder)
+            modules = ForisValidator._module_files(schema_paths)
+        else:
+            definitions, modules = ForisValidator._load(
+                schema_paths, definitions_paths, load_workers, self.decoder)
+            if cache:
+                cache.store(definitions, modules)
+
+        if module_files is None:
+            module_files = ForisValidator._module_files(schema_paths)
+        state = _ValidatorState(definitions, sources, set(definition_files), module_files)
+        for module_name, source in modules.items():
+            if lazy:
+                state.pending_modules[module_name] = source
+            else:
+                self._add_module(state, module_name, source)
+        state.set_modules(modules.keys())
+        self._state = state
+
+        self.error_validator = Draft7Validator(freeze(ERROR_SCHEMA), format_checker=format_checker)
+        self.error_check = ForisValidator._prepare_error_check(self.error_validator)
+
+    @staticmethod
+    def build_bundle(path, schema_paths, definitions_paths=[], load_workers=0, decoder=None):
+        """ Loads and verifies schemas and writes them into a single bundle file
+
+        The bundle refers to the source directories by their absolute paths.
+
+        :param path: path of the bundle file
+        :param load_workers: see __init__()
+        :param decoder: json decoder of schema files (see foris_schema.decoder)
+        :returns: Bundle
+        :raises: the same errors as the constructor
+        """
+        schema_paths = [os.path.abspath(e) for e in schema_paths]
+        definitions_paths = [os.path.abspath(e) for e in definitions_paths]
+        files = ForisValidator._source_files(schema_paths, definitions_paths)
+        sources = ForisValidator._stat_files(files)
+        definitions, modules = ForisValidator._load(
+            schema_paths, definitions_paths, load_workers, decoder)
+        if ForisValidator._stat_files(files) != sources:
+            raise ForisValidationError("Schema files were modified while building the bundle")
+
+        bundle = Bundle(
+            schema_paths, definitions_paths,
+            [(e, *sources[e], file_digest(e)) for e in files],
+            definitions, modules,
+        )
+        bundle.store(path)
+        return bundle
+
+    @classmethod
+    def from_bundle(cls, path, check="contents", fallback=True, **kwargs):
+        """ Creates the validator from a bundle file (see build_bundle())
+
+        :param path: path of the bundle file
+        :param check: how to find out whether the bundle is stale (differs from the source
+                      files): "contents" lists the source directories and compares sizes
+                      and mtimes of the files (and their content hashes when these differ),
+                      "names" only lists the source directories (files rewritten in place
+                      are not noticed), None skips the check
+        :param fallback: load the schemas from the source directories when the bundle is stale
+                         (StaleBundleError is raised otherwise)
+        :param kwargs: other arguments of __init__()
+        :raises BundleError: when the file is not a bundle or its version is not supported
+        """
+        bundle = Bundle.load(path, kwargs.get("decoder"))
+        reason = bundle.stale_reason(check) if check else None
+        if reason is None:
+            return cls(bundle.schema_paths, bundle.definitions_paths, bundle=bundle, **kwargs)
+        if not fallback:
+            raise StaleBundleError("Bundle {} is stale: {}".format(path, reason))
+        logger.warning("Bundle %s is stale (%s), loading the source files", path, reason)
+        return cls(bundle.schema_paths, bundle.definitions_paths, **kwargs)
+
+    @staticmethod
+    def _source_files(schema_paths, definitions_paths):
+        return [
+            os.path.join(path, f)
+            for path in list(definitions_paths) + list(schema_paths)
+            for f in ForisValidator._get_all_jsons_in_dir(path)
+        ]
+
+    @staticmethod
+    def _load(schema_paths, definitions_paths, workers=0, decoder=None):
+        """ Reads and verifies all definitions and module schemas
+
+        :returns: (definitions, {module_name: schema})
+        """
+        definitions = ForisValidator._load_all_definitions(definitions_paths, decoder)
+        if workers > 0:
+            return definitions, ForisValidator._load_modules_parallel(
+                schema_paths, definitions, workers, decoder)
+
+        modules = {}
+
+        # load modules into modules
+        for module_name, file_path in ForisValidator._iter_module_files(schema_paths):
+            if module_name in modules:
+                raise ModuleAlreadyLoaded(module_name)
+            modules[module_name] = ForisValidator._load_module(
+                module_name, file_path, definitions, decoder)
+
+        return definitions, modules
 
-        # Load definition files into self.definitions
+    @staticmethod
+    def _load_modules_parallel(schema_paths, definitions, workers, decoder=None):
+        """ Same as the sequential loading in _load(), but module files are processed
+        in worker processes
+
+        Results are collected in the order of files, so the first error which would be
+        raised by the sequential loading is raised.
+        """
+        module_files = list(ForisValidator._iter_module_files(schema_paths))
+        modules = {}
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_module_loader,
+            initargs=(definitions, decoder),
+        ) as executor:
+            futures = {}
+            for module_name, file_path in module_files:
+                if module_name not in futures:
+                    futures[module_name] = executor.submit(
+                        _load_module_without_definitions, module_name, file_path)
+
+            try:
+                for module_name, _ in module_files:
+                    if module_name in modules:
+                        raise ModuleAlreadyLoaded(module_name)
+                    schema, names = futures[module_name].result()
+                    ForisValidator._merge_definitions(schema, definitions, names)
+                    modules[module_name] = schema
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+        return modules
+
+    @staticmethod
+    def _load_all_definitions(definitions_paths, decoder=None):
+        definitions = {}
         for path in definitions_paths:
             for definition_file in ForisValidator._get_all_jsons_in_dir(path):
                 ForisValidator._load_definitions(
-                    self.definitions, os.path.join(path, definition_file))
+                    definitions, os.path.join(path, definition_file), decoder)
+        # module schemas share the frozen definitions
+        return freeze(definitions)
 
-        # load modules into modules
+    @staticmethod
+    def _iter_module_files(schema_paths):
         for schema_path in schema_paths:
             for module_file in ForisValidator._get_all_jsons_in_dir(schema_path):
-                module_name = module_file[:-5]
-                if module_name in self.validators:
-                    raise ModuleAlreadyLoaded(module_name)
-                try:
-                    with open(os.path.join(schema_path, module_file)) as f:
-                        schema = json.load(f)
-                except json.JSONDecodeError as e:
-                    raise ForisSchemaValidationError(
-                        "Validation of json schema {} failed. Reason: {!r}".format(f.name, e)
-                    ) from e
-
-                # fill-in global definitions (local definitions are not overriden)
-                definitions = schema.get("definitions", {})
-                for name, definition, in self.definitions.items():
-                    if name not in definitions:
-                        definitions[name] = definition
-                schema["definitions"] = definitions
-
-                Draft7Validator.check_schema(schema)
-
-                self.validators[module_name] = ForisValidator._prepare_validator(
-                    module_name, schema)
-
-        self.base_validator = ForisValidator._prepare_base_validator(self.validators.keys())
-        self.error_validator = Draft7Validator(ERROR_SCHEMA, format_checker=format_checker)
+                yield module_file[:-5], os.path.join(schema_path, module_file)
+
+    @staticmethod
+    def _module_files(schema_paths):
+        """ Returns {module_name: file path} """
+        module_files = {}
+        for module_name, file_path in ForisValidator._iter_module_files(schema_paths):
+            if module_name in module_files:
+                raise ModuleAlreadyLoaded(module_name)
+            module_files[module_name] = file_path
+        return module_files
+
+    @staticmethod
+    def _stat_files(paths):
+        sources = {}
+        for path in paths:
+            st = os.stat(path)
+            sources[path] = (st.st_mtime_ns, st.st_size)
+        return sources
+
+    def _add_module(self, state, module_name, schema):
+        schema = freeze(schema)
+        state.validators[module_name], action_validators = \
+            ForisValidator._prepare_validator(schema)
+        state.action_validators.update(action_validators)
+        state.module_actions[module_name] = list(action_validators)
+        for key, validator in action_validators.items():
+            state.action_checks[key] = ForisValidator._prepare_action_check(
+                validator, self.compiled)
+
+    def _load_pending_module(self, state, module_name):
+        with self._lock:
+            source = state.pending_modules.get(module_name)
+            if source is None:
+                return  # loaded by another thread
+            if not isinstance(source, dict):
+                source = ForisValidator._load_module(
+                    module_name, source, state.definitions, self.decoder)
+            self._add_module(state, module_name, source)
+            del state.pending_modules[module_name]
+
+    def reload(self):
+        """ Reloads module schemas whose files were added, changed or removed
+
+        Files are compared by their mtime and size. When a definitions file changes,
+        only modules which use a changed definition are reloaded. The new schemas
+        replace the old ones at once, messages which are being validated meanwhile
+        are validated against the old schemas.
+
+        :returns: {"added": [...], "removed": [...], "reloaded": [...]} module names
+        :raises: the same errors as the constructor (the validator is not changed then)
+        """
+        with self._lock:
+            old = self._state
+            definition_files = ForisValidator._source_files([], self.definitions_paths)
+            sources = ForisValidator._stat_files(
+                ForisValidator._source_files(self.schema_paths, self.definitions_paths))
+            result = {"added": [], "removed": [], "reloaded": []}
+            if sources == old.sources:
+                return result
+
+            changed_files = {
+                path for path in set(sources) | set(old.sources)
+                if sources.get(path) != old.sources.get(path)
+            }
+
+            definitions = old.definitions
+            changed_definitions = set()
+            if changed_files & (set(definition_files) | old.definition_files):
+                definitions = ForisValidator._load_all_definitions(
+                    self.definitions_paths, self.decoder)
+                changed_definitions = {
+                    name for name in set(definitions) | set(old.definitions)
+                    if definitions.get(name) != old.definitions.get(name)
+                }
+                # kept modules hold the current objects of unchanged definitions
+                definitions = freeze({
+                    name: definition if name in changed_definitions else old.definitions[name]
+                    for name, definition in definitions.items()
+                })
+
+            module_files = ForisValidator._module_files(self.schema_paths)
+            state = _ValidatorState(definitions, sources, set(definition_files), module_files)
+            for module_name, file_path in module_files.items():
+                if module_name not in old.module_files:
+                    result["added"].append(module_name)
+                elif file_path in changed_files or file_path != old.module_files[module_name] \
+                        or self._uses_definitions(old, module_name, changed_definitions):
+                    result["reloaded"].append(module_name)
+                else:
+                    # keep already built validators
+                    if module_name in old.pending_modules:
+                        state.pending_modules[module_name] = old.pending_modules[module_name]
+                    else:
+                        state.validators[module_name] = old.validators[module_name]
+                        keys = state.module_actions[module_name] = old.module_actions[module_name]
+                        for key in keys:
+                            state.action_validators[key] = old.action_validators[key]
+                            state.action_checks[key] = old.action_checks[key]
+                    continue
+
+                if self.lazy:
+                    state.pending_modules[module_name] = file_path
+                else:
+                    self._add_module(state, module_name, ForisValidator._load_module(
+                        module_name, file_path, definitions, self.decoder))
+
+            result["removed"] = [e for e in old.module_files if e not in module_files]
+            if result["added"] or result["removed"]:
+                state.set_modules(module_files.keys())
+            else:
+                state.base_validator = old.base_validator
+                state.envelope_check = old.envelope_check
+
+            self._state = state
+
+        if self._result_cache is not None:
+            self._result_cache.clear()
+        return result
+
+    @staticmethod
+    def _uses_definitions(state, module_name, names):
+        """ Whether the loaded module uses any of the global definitions """
+        if not names:
+            return False
+        schema = state.validators[module_name].schema if module_name in state.validators \
+            else state.pending_modules[module_name]
+        if not isinstance(schema, dict):
+            return False  # not loaded yet
+        used = refs.referenced_definitions(schema)
+        if used is None:
+            return True
+        return any(
+            schema["definitions"].get(name) is state.definitions.get(name)
+            for name in used & names
+        )
+
+    @staticmethod
+    def _get_action_validator(state, msg):
+        """ Returns validator of the oneOf branch matching the message
+        or module validator when no such branch exists
+        """
+        return state.action_validators.get(
+            (msg["module"], msg["kind"], msg["action"]), state.validators[msg["module"]]
+        )
+
+    def result_cache_stats(self):
+        """ Returns hits, misses, evictions, size and maxsize of the result cache (or None) """
+        return self._result_cache.stats() if self._result_cache is not None else None
+
+    def clear_result_cache(self):
+        if self._result_cache is not None:
+            self._result_cache.clear()
 
     def validate(self, msg):
-        self.base_validator.validate(msg)
+        if self._result_cache is not None:
+            self._cached_validate(msg)
+        else:
+            self._validate(msg)
+
+    def _cached_validate(self, msg):
+        fingerprint = ResultCache.fingerprint(msg)
+        if fingerprint is None:
+            self._validate(msg)
+            return
+
+        generation = self._result_cache.generation
+        cached = self._result_cache.get(fingerprint, msg)
+        if cached is not None:
+            valid, error = cached
+            if valid:
+                return
+            if error is not None:
+                raise error.with_traceback(None)
+
         try:
-            self.validators[msg["module"]].validate(msg)  # finally with module validator
-        except ValidationError as exc:
-            # Test whether it is an error message
-            if self.error_validator.is_valid(msg):
-                return  # Pass errror message
-
-            # Prepare more verbose output
-            schema = copy.deepcopy(self.validators[msg["module"]].schema)
-            relevant_lines = [
-                e for e in schema["oneOf"]
-                if e["properties"]["action"]["enum"][0] == msg["action"]
-                and e["properties"]["kind"]["enum"][0] == msg["kind"]
-            ]
-            if relevant_lines and len(relevant_lines) == 1:
-                mini_schema = {
-                    "$schema": schema["$schema"],
-                    "definitions": schema["definitions"],
-                }
-                for k, v in relevant_lines[0].items():
-                    mini_schema[k] = v
+            self._validate(msg)
+        except ValidationError as e:
+            self._result_cache.put(fingerprint, msg, False, e, generation)
+            raise
+        self._result_cache.put(fingerprint, msg, True, None, generation)
+
+    def _validate(self, msg):
+        """ Validates the message
 
-                # This should rise more verbose exception
-                Draft7Validator(mini_schema, format_checker=format_checker).validate(msg)
+        :returns: RESULT_VALID or RESULT_ERROR_MESSAGE
+        :raises ValidationError: when the message is not valid
+        """
+        state = self._state
+        if not state.envelope_check(msg):
+            state.base_validator.validate(msg)  # raises the detailed error
+        if msg["module"] in state.pending_modules:
+            self._load_pending_module(state, msg["module"])
+        if "errors" in msg and self.error_check(msg):
+            return RESULT_ERROR_MESSAGE  # skip the module schema
+        if self.compiled:
+            check = state.action_checks.get((msg["module"], msg["kind"], msg["action"]))
+            if check is not None and check(msg):
+                return RESULT_VALID
+        if self.metrics is not None:
+            start = time.perf_counter()
+        try:
+            self._get_action_validator(state, msg).validate(msg)  # finally with module validator
+        except ValidationError:
+            # error messages were already passed above
+            if self.metrics is not None:
+                self.metrics.record_verbose(
+                    (msg["module"], msg["kind"], msg["action"]), time.perf_counter() - start)
+
+            # Action validators are built from the relevant oneOf branch only,
+            # so the raised exception is already verbose enough
+            raise
+        return RESULT_VALID
+
+    def _measured_validate(self, msg):
+        start = time.perf_counter()
+        try:
+            result = ForisValidator._validate(self, msg)
+        except ValidationError:
+            self.metrics.record(_message_key(msg), "invalid", time.perf_counter() - start)
+            raise
+        self.metrics.record(_message_key(msg), _outcome(result), time.perf_counter() - start)
+        return result
+
+    def validate_bytes(self, payload):
+        """ Decodes and validates a raw message
 
-            raise exc  # Raise original exception
+        module, kind and action are read from the beginning of the payload first. When they
+        are there and they are not valid, the message is rejected without decoding the rest
+        of the payload (the error describes only these three keys then), unless the keys may
+        be repeated later in the payload. Otherwise the payload is decoded (see the decoder
+        argument) and validated as by validate().
+
+        :param payload: json message (bytes or str)
+        :returns: decoded message
+        :raises ValidationError: when the message is not valid
+        :raises ValueError: when the payload is not json (json.JSONDecodeError)
+        """
+        if self.metrics is not None:
+            start = time.perf_counter()
+        envelope = leading_members(payload, ENVELOPE_KEYS)
+        if envelope is not None and len(envelope) == len(ENVELOPE_KEYS):
+            state = self._state
+            if not state.envelope_check(envelope) and unique_members(payload, ENVELOPE_KEYS):
+                if self.metrics is not None:
+                    self.metrics.record(
+                        _message_key(envelope), "invalid", time.perf_counter() - start)
+                state.base_validator.validate(envelope)  # raises the detailed error
+
+        msg = self.decoder.loads(payload)
+        self.validate(msg)
+        return msg
 
     def is_valid(self, msg):
-        if not self.base_validator.is_valid(msg):
+        if self._result_cache is not None:
+            fingerprint = ResultCache.fingerprint(msg)
+            if fingerprint is not None:
+                generation = self._result_cache.generation
+                cached = self._result_cache.get(fingerprint, msg)
+                if cached is not None:
+                    return cached[0]
+                result = self._is_valid(msg)
+                self._result_cache.put(fingerprint, msg, result, None, generation)
+                return result
+        return self._is_valid(msg)
+
+    def _is_valid(self, msg):
+        state = self._state
+        if not state.envelope_check(msg):
             return False
-        if not self.validators[msg["module"]].is_valid(msg):
-            if self.error_validator.is_valid(msg):
-                return True  # it is an error message
+        if msg["module"] in state.pending_modules:
+            self._load_pending_module(state, msg["module"])
+        if "errors" in msg and self.error_check(msg):
+            return True  # it is an error message
+        check = state.action_checks.get((msg["module"], msg["kind"], msg["action"]))
+        return check is not None and check(msg)
+
+    def _measured_is_valid(self, msg):
+        # same as _is_valid(), but it distinguishes error messages
+        start = time.perf_counter()
+        state = self._state
+        if not state.envelope_check(msg):
+            outcome = "invalid"
+        else:
+            if msg["module"] in state.pending_modules:
+                self._load_pending_module(state, msg["module"])
+            check = state.action_checks.get((msg["module"], msg["kind"], msg["action"]))
+            if "errors" in msg and self.error_check(msg):
+                outcome = "error"
+            elif check is not None and check(msg):
+                outcome = "valid"
             else:
-                return False
+                outcome = "invalid"
+        self.metrics.record(_message_key(msg), outcome, time.perf_counter() - start)
+        return outcome != "invalid"
+
+    def _invalid_result(self, validator, msg, errors):
+        if not errors:
+            return RESULT_INVALID
+        return ValidationResult(False, False, best_match(validator.iter_errors(msg)))
+
+    def validate_many(self, messages, errors=True):
+        """ Validates multiple messages at once
+
+        Messages are grouped by (module, kind, action) so the validators are looked up
+        only once per group.
+
+        :param messages: iterable of messages
+        :param errors: find the most relevant error of invalid messages
+        :returns: list of ValidationResult (in the same order as messages)
+        """
+        messages = list(messages)
+        results = [None] * len(messages)
+        metrics = self.metrics
+        state = self._state
+
+        groups = {}
+        for i, msg in enumerate(messages):
+            if not state.envelope_check(msg):
+                if metrics is not None:
+                    start = time.perf_counter()
+                results[i] = self._invalid_result(state.base_validator, msg, errors)
+                if metrics is not None:
+                    metrics.record(_message_key(msg), "invalid", time.perf_counter() - start)
+                continue
+            groups.setdefault((msg["module"], msg["kind"], msg["action"]), []).append(i)
+
+        for key, indexes in groups.items():
+            if key[0] in state.pending_modules:
+                self._load_pending_module(state, key[0])
+            check = state.action_checks.get(key)
+            validator = state.action_validators.get(key) or state.validators[key[0]]
+            for i in indexes:
+                msg = messages[i]
+                if metrics is not None:
+                    start = time.perf_counter()
+                if "errors" in msg and self.error_check(msg):
+                    results[i] = RESULT_ERROR_MESSAGE
+                elif check is not None and check(msg):
+                    results[i] = RESULT_VALID
+                else:
+                    results[i] = self._invalid_result(validator, msg, errors)
+                if metrics is not None:
+                    metrics.record(key, _outcome(results[i]), time.perf_counter() - start)
+
+        return results
+
+    def iter_validate(self, messages, errors=True, chunk_size=256):
+        """ Lazily validates messages and yields ValidationResult for each of them
+
+        Messages are processed in chunks (see validate_many()).
+        """
+        iterator = iter(messages)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self.validate_many(chunk, errors)
+
+
+_loader_definitions = None  # global definitions in module loading processes
+_loader_decoder = None
+
+
+def _init_module_loader(definitions, decoder=None):
+    global _loader_definitions, _loader_decoder
+    _loader_definitions = definitions
+    _loader_decoder = decoder
+
+
+def _portable_error(error):
+    """ jsonschema errors are bound to a validator which can't be pickled """
+    return type(error)(
+        error.message,
+        validator=error.validator,
+        path=error.path,
+        schema_path=error.schema_path,
+        context=[_portable_error(e) for e in error.context],
+        validator_value=error.validator_value,
+        instance=error.instance,
+        schema=error.schema,
+    )
+
+
+def _load_module_without_definitions(module_name, file_path):
+    """ Loads module schema in a worker process
+
+    Global definitions are removed from the result, so they are not sent back
+    (the caller fills them in again).
+
+    :returns: (schema, names of removed global definitions)
+    """
+    try:
+        schema = ForisValidator._load_module(
+            module_name, file_path, _loader_definitions, _loader_decoder)
+    except (ValidationError, SchemaError) as e:
+        raise _portable_error(e) from None
 
-        return True
+    local_definitions = {}
+    names = set()
+    for name, definition in schema["definitions"].items():
+        if _loader_definitions.get(name) is definition:
+            names.add(name)
+        else:
+            local_definitions[name] = definition
+    schema["definitions"] = local_definitions
+    return schema, names
@@ -0,0 +1,82 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Automatic reloading of changed schema files """
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaWatcher(object):
+    """ Periodically checks mtimes of schema files and reloads the validator when they change
+
+    The check runs in a background thread and calls ForisValidator.reload().
+    When the reload fails, the validator keeps the previous schemas and the error
+    is logged (and passed to on_error).
+    """
+
+    def __init__(self, validator, interval=5.0, on_reload=None, on_error=None):
+        """
+        :param validator: ForisValidator instance
+        :param interval: seconds between checks
+        :param on_reload: called with the result of reload() when some modules changed
+        :param on_error: called with the exception when the reload fails
+        """
+        self.validator = validator
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """ Reloads the validator if needed (called by the background thread) """
+        try:
+            result = self.validator.reload()
+        except Exception as e:
+            logger.warning("Failed to reload schemas: %r", e)
+            if self.on_error:
+                self.on_error(e)
+            return
+        if any(result.values()):
+            logger.info("Schemas reloaded: %s", result)
+            if self.on_reload:
+                self.on_reload(result)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="foris-schema-watcher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
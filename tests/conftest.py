@@ -0,0 +1,44 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+
+import pytest
+
+
+SIMPLE = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}}
+EXTERNAL = {
+    "module": "definitions-external", "kind": "request", "action": "get",
+    "data": {"object1": {"substring": "abc"}, "string1": "abc"},
+}
+
+
+@pytest.fixture
+def schema_dirs(tmp_path):
+    """ Copies of the simple and definitions-external module schemas and of the global
+    definitions, so that tests can modify them
+
+    :returns: (modules directory, definitions directory)
+    """
+    modules = tmp_path / "modules"
+    definitions = tmp_path / "definitions"
+    modules.mkdir()
+    definitions.mkdir()
+    shutil.copy("tests/schemas/modules/simple/simple.json", modules)
+    shutil.copy("tests/schemas/modules/definitions-external/definitions-external.json", modules)
+    shutil.copy(
+        "tests/schemas/definitions/definitions-external/definitions-external.json", definitions)
+    return str(modules), str(definitions)
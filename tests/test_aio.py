@@ -0,0 +1,93 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import threading
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.aio import AsyncForisValidator, message_size
+
+
+SMALL = {"module": "simple", "kind": "notification", "action": "triggered",
+         "data": {"event": "x"}}
+LARGE = {"module": "simple", "kind": "notification", "action": "triggered",
+         "data": {"event": "x" * 100000}}
+INVALID = {"module": "simple", "kind": "notification", "action": "triggered",
+           "data": {"event": "x" * 100000, "extra": list(range(1000))}}
+
+
+class RecordingValidator(object):
+    def __init__(self):
+        self.validator = ForisValidator(["tests/schemas/modules/simple/"])
+        self.threads = []
+
+    def validate(self, msg):
+        self.threads.append(threading.current_thread())
+        return self.validator.validate(msg)
+
+    def is_valid(self, msg):
+        self.threads.append(threading.current_thread())
+        return self.validator.is_valid(msg)
+
+
+def test_message_size():
+    assert message_size(SMALL, 100) == 6
+    assert message_size(LARGE, 100) > 100
+    assert message_size({"a": list(range(10 ** 6))}, 100) == 101
+
+
+def test_inline_and_executor():
+    validator = RecordingValidator()
+    async_validator = AsyncForisValidator(validator, max_inline_size=100)
+
+    async def run():
+        await async_validator.validate(SMALL)
+        assert await async_validator.is_valid(SMALL)
+        await async_validator.validate(LARGE)
+        assert await async_validator.is_valid(LARGE)
+        assert not await async_validator.is_valid(INVALID)
+        with pytest.raises(ValidationError):
+            await async_validator.validate(INVALID)
+
+    asyncio.run(run())
+    main = threading.main_thread()
+    assert validator.threads[:2] == [main, main]
+    assert all(thread is not main for thread in validator.threads[2:])
+
+
+def test_concurrency_limit():
+    active = []
+    maximum = []
+
+    class SlowValidator(object):
+        def is_valid(self, msg):
+            active.append(msg)
+            maximum.append(len(active))
+            threading.Event().wait(0.01)
+            active.remove(msg)
+            return True
+
+    async_validator = AsyncForisValidator(SlowValidator(), max_inline_size=0, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*[async_validator.is_valid({"i": i}) for i in range(10)])
+
+    assert asyncio.run(run()) == [True] * 10
+    assert max(maximum) <= 2
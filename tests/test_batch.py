@@ -0,0 +1,78 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.validator import ValidationResult
+
+
+MESSAGES = [
+    {"module": "simple", "kind": "request", "action": "get"},
+    {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}},
+    {"module": "simple", "kind": "reply", "action": "get", "data": {"result": "x"}},
+    {"module": "simple", "kind": "request", "action": "get", "extra": 1},
+    {"module": "non-existing", "kind": "request", "action": "get"},
+    {"module": "simple", "kind": "request", "action": "non-existing"},
+    {"module": "simple", "kind": "reply", "action": "get",
+     "errors": [{"description": "failed", "stacktrace": ""}]},
+    {"module": "simple", "kind": "request", "action": "get"},
+    "not a message",
+]
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["interpreted", "compiled"])
+def validator(request):
+    return ForisValidator(["tests/schemas/modules/simple/"], compiled=request.param)
+
+
+def test_validate_many(validator):
+    results = validator.validate_many(MESSAGES)
+    assert len(results) == len(MESSAGES)
+    for msg, result in zip(MESSAGES, results):
+        assert isinstance(result, ValidationResult)
+        assert result.valid == validator.is_valid(msg)
+        if result.valid:
+            assert result.error is None
+        else:
+            assert isinstance(result.error, ValidationError)
+            with pytest.raises(ValidationError):
+                validator.validate(msg)
+
+    assert [r.error_message for r in results] == [
+        False, False, False, False, False, False, True, False, False]
+    assert "'x' is not of type 'boolean'" in results[2].error.message
+    assert "'non-existing' is not one of ['simple']" in results[4].error.message
+
+
+def test_without_errors(validator):
+    results = validator.validate_many(MESSAGES, errors=False)
+    assert [r.valid for r in results] == [validator.is_valid(msg) for msg in MESSAGES]
+    assert all(r.error is None for r in results)
+
+
+def test_iter_validate(validator):
+    messages = (msg for msg in MESSAGES * 10)
+    results = validator.iter_validate(messages, chunk_size=4)
+    assert [r.valid for r in results] == [validator.is_valid(msg) for msg in MESSAGES * 10]
+
+
+def test_lazy():
+    validator = ForisValidator(["tests/schemas/modules/simple/"], lazy=True)
+    assert [r.valid for r in validator.validate_many(MESSAGES)] == [
+        True, True, False, False, False, False, True, True, False]
@@ -0,0 +1,165 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.bundle import Bundle, BundleError, StaleBundleError
+
+
+from .conftest import EXTERNAL, SIMPLE
+
+
+@pytest.fixture
+def dirs(schema_dirs, tmp_path):
+    return schema_dirs + (str(tmp_path / "bundle.json"),)
+
+
+def _modify(path):
+    with open(path) as f:
+        schema = json.load(f)
+    schema["oneOf"] = [e for e in schema["oneOf"] if e["properties"]["kind"]["enum"] != ["reply"]]
+    with open(path, "w") as f:
+        json.dump(schema, f)
+
+
+def test_from_bundle(dirs, monkeypatch):
+    modules, definitions, path = dirs
+    ForisValidator.build_bundle(path, [modules], [definitions])
+    expected = ForisValidator([modules], [definitions])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("source files should not be loaded")
+
+    monkeypatch.setattr(ForisValidator, "_load_module", fail)
+    monkeypatch.setattr(ForisValidator, "_load_definitions", fail)
+    monkeypatch.setattr(ForisValidator, "_stat_files", fail)
+    for check in ("names", "contents", None):
+        validator = ForisValidator.from_bundle(path, check=check)
+        assert validator.schema_paths == [os.path.abspath(modules)]
+        assert validator.definitions == expected.definitions
+        for name in ("simple", "definitions-external"):
+            schema = validator.get_module_schema(name)
+            assert schema == expected.get_module_schema(name)
+            for definition in validator.definitions:
+                if definition in schema["definitions"]:
+                    assert schema["definitions"][definition] is validator.definitions[definition]
+        validator.validate(SIMPLE)
+        validator.validate(EXTERNAL)
+
+    validator = ForisValidator.from_bundle(path, lazy=True, compiled=True)
+    assert set(validator._state.pending_modules) == {"simple", "definitions-external"}
+    validator.validate(SIMPLE)
+
+
+def test_stale_names(dirs):
+    modules, definitions, path = dirs
+    ForisValidator.build_bundle(path, [modules], [definitions])
+    shutil.copy("tests/schemas/modules/definitions/definitions.json", modules)
+
+    assert "added" in Bundle.load(path).stale_reason("names")
+    with pytest.raises(StaleBundleError):
+        ForisValidator.from_bundle(path, fallback=False)
+    validator = ForisValidator.from_bundle(path)
+    assert "definitions" in validator.validators
+
+    # not checked at all
+    validator = ForisValidator.from_bundle(path, check=None)
+    assert "definitions" not in validator.validators
+
+    os.unlink(os.path.join(modules, "simple.json"))
+    assert Bundle.load(path).stale_reason("names") is not None
+    shutil.rmtree(definitions)
+    assert "can't be read" in Bundle.load(path).stale_reason("names")
+
+
+def test_stale_contents(dirs):
+    modules, definitions, path = dirs
+    ForisValidator.build_bundle(path, [modules], [definitions])
+    simple = os.path.join(modules, "simple.json")
+
+    # mtime changed, but the content is the same
+    st = os.stat(simple)
+    os.utime(simple, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert Bundle.load(path).stale_reason("contents") is None
+
+    _modify(simple)
+    bundle = Bundle.load(path)
+    assert "simple.json" in bundle.stale_reason()
+    with pytest.raises(StaleBundleError):
+        ForisValidator.from_bundle(path, fallback=False)
+    assert not ForisValidator.from_bundle(path).is_valid(SIMPLE)
+
+    # only names are compared
+    assert bundle.stale_reason("names") is None
+    assert ForisValidator.from_bundle(path, check="names").is_valid(SIMPLE)
+
+    with pytest.raises(ValueError):
+        bundle.stale_reason("unknown")
+
+
+def test_reload(dirs):
+    modules, definitions, path = dirs
+    ForisValidator.build_bundle(path, [modules], [definitions])
+    validator = ForisValidator.from_bundle(path)
+    assert validator.reload() == {"added": [], "removed": [], "reloaded": []}
+
+    _modify(os.path.join(modules, "simple.json"))
+    os.utime(os.path.join(modules, "simple.json"), ns=(0, 10 ** 9))
+    assert validator.reload()["reloaded"] == ["simple"]
+    assert not validator.is_valid(SIMPLE)
+
+
+def test_incompatible(dirs):
+    modules, definitions, path = dirs
+    ForisValidator.build_bundle(path, [modules], [definitions])
+    with open(path) as f:
+        data = json.load(f)
+    data["foris_schema"] = "0.0"
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert "foris-schema 0.0" in Bundle.load(path).stale_reason()
+    ForisValidator.from_bundle(path).validate(SIMPLE)
+
+    data["version"] += 1
+    with open(path, "w") as f:
+        json.dump(data, f)
+    for check in ("contents", None):
+        with pytest.raises(BundleError):
+            ForisValidator.from_bundle(path, check=check)
+
+    with open(path, "w") as f:
+        json.dump({"modules": {}}, f)
+    with pytest.raises(BundleError):
+        ForisValidator.from_bundle(path)
+    with open(path, "w") as f:
+        f.write("{")
+    with pytest.raises(BundleError):
+        ForisValidator.from_bundle(path)
+
+
+def test_cli(dirs):
+    modules, definitions, path = dirs
+    res = subprocess.run(
+        ["foris-schema", "--bundle", path, modules, "-d", definitions], stdout=subprocess.PIPE)
+    assert res.returncode == 0
+    assert b"2 modules" in res.stdout
+    ForisValidator.from_bundle(path, fallback=False).validate(EXTERNAL)
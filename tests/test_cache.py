@@ -0,0 +1,96 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+
+import pytest
+
+from foris_schema import ForisValidator
+
+
+MSG = {
+    "module": "definitions-external", "kind": "request", "action": "get",
+    "data": {"object1": {"substring": "bbbcc"}, "string1": "aaa"},
+}
+
+
+@pytest.fixture
+def dirs(schema_dirs, tmp_path):
+    return [schema_dirs[0]], [schema_dirs[1]], str(tmp_path / "cache")
+
+
+def _disable_loading(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("schemas should be loaded from cache")
+
+    monkeypatch.setattr(ForisValidator, "_load", fail)
+
+
+def _create(dirs):
+    schema_paths, definitions_paths, cache_dir = dirs
+    return ForisValidator(schema_paths, definitions_paths, cache_dir=cache_dir)
+
+
+def test_cached(dirs, monkeypatch):
+    validator = _create(dirs)
+    assert validator.is_valid(MSG)
+    assert len(os.listdir(dirs[2])) == 1
+
+    _disable_loading(monkeypatch)
+    cached = _create(dirs)
+    assert cached.is_valid(MSG)
+    assert not cached.is_valid(dict(MSG, data={"object1": {"substring": "A"}, "string1": "a"}))
+    assert set(cached.validators) == {"definitions-external", "simple"}
+    assert cached.get_module_schema("simple") == validator.get_module_schema("simple")
+    assert cached.definitions == validator.definitions
+
+
+def test_touched(dirs, monkeypatch):
+    _create(dirs)
+    path = os.path.join(dirs[0][0], "simple.json")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    _disable_loading(monkeypatch)
+    assert _create(dirs).is_valid(MSG)
+
+
+def test_modified(dirs):
+    _create(dirs)
+
+    path = os.path.join(dirs[1][0], "definitions-external.json")
+    with open(path) as f:
+        definitions = json.load(f)
+    definitions["definitions"]["lower"]["pattern"] = "^[A-Z]+$"
+    with open(path, "w") as f:
+        json.dump(definitions, f)
+
+    assert not _create(dirs).is_valid(MSG)
+
+
+def test_file_removed(dirs):
+    _create(dirs)
+    os.unlink(os.path.join(dirs[0][0], "simple.json"))
+    assert set(_create(dirs).validators) == {"definitions-external"}
+
+
+def test_corrupted(dirs):
+    _create(dirs)
+    cache_file = os.path.join(dirs[2], os.listdir(dirs[2])[0])
+    with open(cache_file, "w") as f:
+        f.write("{")
+    assert _create(dirs).is_valid(MSG)
@@ -80,3 +80,36 @@ def test_pipe_input(mock_json, retval, msg):
     ret = subprocess.run(BASE_COMMAND, input=data, stderr=PIPE)
     assert ret.returncode == retval
     assert msg in ret.stderr
+
+
+NDJSON = b'\n'.join([
+    json.dumps(SIMPLE_JSON).encode(),
+    json.dumps(SIMPLE_ERROR).encode(),
+    b'',
+    b'key: value',
+    json.dumps({"module": "simple", "kind": "request", "action": "get"}).encode(),
+]) + b'\n'
+
+
+def test_ndjson_pipe():
+    ret = subprocess.run([*BASE_COMMAND, '--ndjson'], input=NDJSON, stdout=PIPE, stderr=PIPE)
+    assert ret.returncode == 1
+    lines = ret.stdout.splitlines()
+    assert lines[0] == b'1: valid simple/reply/get'
+    assert lines[1].startswith(b'2: invalid simple/reply/get: Additional properties')
+    assert lines[2].startswith(b'4: not json')
+    assert lines[3] == b'5: valid simple/request/get'
+    assert b'Messages: 4' in ret.stderr
+    assert b'  valid: 2' in ret.stderr
+    assert b'  simple/reply/get: 1' in ret.stderr
+    assert b'messages/s' in ret.stderr
+
+
+def test_ndjson_file(tmp_path):
+    path = tmp_path / 'messages.ndjson'
+    path.write_bytes(json.dumps(SIMPLE_JSON).encode() + b'\n' + json.dumps(SIMPLE_JSON).encode())
+    ret = subprocess.run(
+        [*BASE_COMMAND, '--ndjson', '-i', str(path)], stdin=None, stdout=PIPE, stderr=PIPE)
+    assert ret.returncode == 0
+    assert ret.stdout.splitlines() == [b'1: valid simple/reply/get', b'2: valid simple/reply/get']
+    assert b'Messages: 2' in ret.stderr
@@ -0,0 +1,209 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import json
+import re
+
+import pytest
+
+from jsonschema import Draft7Validator, ValidationError, validators
+
+from foris_schema import ForisValidator
+from foris_schema.compiler import compile_schema, SchemaCompilationError
+from foris_schema.custom_format_checkers import format_checker
+
+
+SCHEMA_SETS = [
+    (["tests/schemas/modules/simple/"], []),
+    (["tests/schemas/modules/definitions/"], []),
+    (["tests/schemas/modules/definitions-external/"],
+     ["tests/schemas/definitions/definitions-external/"]),
+    (["tests/schemas/modules/custom_format_checkers/"], []),
+    (["tests/schemas/modules/override_definition/"],
+     ["tests/schemas/definitions/override_definition/"]),
+    (["tests/schemas/modules/no_override_definition/"],
+     ["tests/schemas/definitions/override_definition/"]),
+    (["tests/schemas/modules/redefinition/redefinition1",
+      "tests/schemas/modules/redefinition/redefinition2"], []),
+    (["tests/schemas/modules/keywords/"], []),
+]
+
+VALUES = [
+    None, True, False, 0, 1, 3, 6, -1, 1.0, 1.5, 0.5, 12.5, 70000, 2 ** 70,
+    "", "a", "aaa", "Aaa", "bbbcc", "on", "off", "main", "x-a", "toolongname",
+    "10.0.0.1", "::1", "fe80::1%eth0", "10.0.0.0/8", "::1/64", "255.255.0.0",
+    "255.253.0.0", "00:11:22:33:44:55", "00:11:22:33:44",
+    [], ["main"], ["main", "main"], ["main", "other"], ["a", "b", "c", "main"], [1], ["a", True],
+    ["a", True, 1], {}, {"a": 1}, {"x-a": "b"}, {"x-a": 1}, {"toolongname": 1},
+    {"X-a": 1}, {"aa": 1}, {"xaa": 1}, {"ab": 1},
+    {"result": True}, {"event": "x"}, {"substring": "bbbcc"}, {"substring": "B"},
+    {"name": "root"}, {"name": "root", "children": [{"name": "leaf"}]},
+    {"name": "root", "children": [{"name": ""}]}, {"name": "root", "children": [{}]},
+]
+
+
+def _property_names(schema, definitions, depth=0):
+    if not isinstance(schema, dict) or depth > 3:
+        return set()
+    if "$ref" in schema:
+        return _property_names(
+            definitions.get(schema["$ref"].split("/")[-1]), definitions, depth + 1)
+    names = set(schema.get("properties", {}))
+    for subschema in schema.get("properties", {}).values():
+        names |= _property_names(subschema, definitions, depth + 1)
+    return names
+
+
+def _messages(validator):
+    for module_name in validator.validators:
+        schema = validator.get_module_schema(module_name)
+        for branch in schema["oneOf"]:
+            envelope = {
+                "module": module_name,
+                "kind": branch["properties"]["kind"]["enum"][0],
+                "action": branch["properties"]["action"]["enum"][0],
+            }
+            yield dict(envelope)
+            yield dict(envelope, extra=1)
+            yield dict(envelope, errors=[{"description": "error", "stacktrace": ""}])
+            names = sorted(_property_names(branch["properties"].get("data"), schema["definitions"]))
+            for value in VALUES:
+                yield dict(envelope, data=value)
+                yield dict(envelope, data={name: value for name in names})
+                for name in names:
+                    yield dict(envelope, data={name: value})
+            for first, second in itertools.permutations(VALUES[:20], 2):
+                yield dict(envelope, data={
+                    name: first if i % 2 else second for i, name in enumerate(names)})
+
+
+@pytest.mark.parametrize("schema_paths,definitions_paths", SCHEMA_SETS)
+def test_differential(schema_paths, definitions_paths):
+    interpreted = ForisValidator(schema_paths, definitions_paths)
+    compiled = ForisValidator(schema_paths, definitions_paths, compiled=True)
+
+    checked = 0
+    for msg in _messages(interpreted):
+        expected = interpreted.is_valid(msg)
+        assert compiled.is_valid(msg) == expected, msg
+        if expected:
+            compiled.validate(msg)
+        else:
+            with pytest.raises(ValidationError) as interpreted_exc:
+                interpreted.validate(msg)
+            with pytest.raises(ValidationError) as compiled_exc:
+                compiled.validate(msg)
+            assert str(compiled_exc.value) == str(interpreted_exc.value)
+        checked += 1
+    assert checked > 0
+
+
+def _additional_properties(validator, additional, instance, schema):
+    if not validator.is_type(instance, "object"):
+        return
+    for key in instance:
+        if key in schema.get("properties", {}) or any(
+                re.search(pattern, key) for pattern in schema.get("patternProperties", {})):
+            continue
+        if additional is False:
+            yield ValidationError("Additional property %r" % key)
+        else:
+            yield from validator.descend(instance[key], additional, path=key)
+
+
+# jsonschema joins all patternProperties into a single regular expression to find additional
+# properties, which fails for patterns with flags, same group names or backreferences
+_ReferenceValidator = validators.extend(
+    Draft7Validator, {"additionalProperties": _additional_properties})
+
+
+@pytest.mark.parametrize("schema", [
+    True,
+    False,
+    {"type": "integer"},
+    {"type": ["string", "number"]},
+    {"enum": [1, "1", True, None, [1], {"a": 1}]},
+    {"const": False},
+    {"const": [1, {"a": 0}]},
+    {"format": "ipv4netmask"},
+    {"format": "macaddress"},
+    {"minimum": 1, "exclusiveMaximum": 6},
+    {"multipleOf": 3},
+    {"multipleOf": 0.1},
+    {"uniqueItems": True},
+    {"items": False},
+    {"items": [True, False]},
+    {"items": [{"type": "string"}], "additionalItems": {"type": "boolean"}},
+    {"contains": {"type": "array"}},
+    {"required": ["a"], "minProperties": 2},
+    {"patternProperties": {"^x-": False, "b": {"type": "integer"}}, "additionalProperties": False},
+    {"patternProperties": {"^a": {}, "(?i)^x": {}}, "additionalProperties": False},
+    {"patternProperties": {"(?P<n>a)$": {}, "(?P<n>b)": {}}, "additionalProperties": False},
+    {"patternProperties": {"^(x)": {"type": "string"}, "(a)\\1": {}},
+     "additionalProperties": False},
+    {"dependencies": {"a": {"required": ["result"]}, "x-a": ["a"]}},
+    {"propertyNames": {"pattern": "^[a-z]$"}},
+    {"allOf": [{"type": "object"}, {"maxProperties": 1}]},
+    {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+    {"if": {"type": "string"}, "else": {"type": "array"}},
+    {"not": {"type": "null"}},
+    {"definitions": {"a": {"$ref": "#/definitions/b"}, "b": {"type": "boolean"}},
+     "$ref": "#/definitions/a", "type": "string"},
+    {"definitions": {"list": {"type": "array", "items": {"$ref": "#/definitions/list"}}},
+     "$ref": "#/definitions/list"},
+])
+def test_keywords(schema):
+    check = compile_schema(schema)
+    validator = _ReferenceValidator(schema, format_checker=format_checker)
+    for value in VALUES:
+        assert check(value) == validator.is_valid(value), value
+
+
+def test_unsupported():
+    with pytest.raises(SchemaCompilationError):
+        compile_schema({"$ref": "http://example.com/schema.json"})
+
+    with pytest.raises(SchemaCompilationError):
+        compile_schema({"$ref": "#/definitions/missing"})
+
+    with pytest.raises(SchemaCompilationError):
+        compile_schema({"type": "unknown"})
+
+    with pytest.raises(SchemaCompilationError):
+        compile_schema({"pattern": "(?<n>a)"})
+
+
+def test_pattern_properties_module(tmp_path):
+    data = {
+        "type": "object",
+        "patternProperties": {"^a": {}, "(?i)^x": {"type": "integer"}},
+        "additionalProperties": False,
+    }
+    (tmp_path / "patterns.json").write_text(json.dumps({"oneOf": [{
+        "properties": {
+            "module": {"enum": ["patterns"]},
+            "kind": {"enum": ["request"]},
+            "action": {"enum": ["get"]},
+            "data": data,
+        },
+        "additionalProperties": False,
+        "required": ["data"],
+    }]}))
+    validator = ForisValidator([str(tmp_path)], compiled=True)
+    msg = {"module": "patterns", "kind": "request", "action": "get", "data": {"ab": 1, "X": 2}}
+    assert validator.is_valid(msg)
+    assert not validator.is_valid(dict(msg, data={"X": "a"}))
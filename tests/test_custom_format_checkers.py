@@ -15,11 +15,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import re
+import socket
+import struct
+
 import pytest
 
-from jsonschema import ValidationError
+from jsonschema import FormatChecker, ValidationError
+from jsonschema import _format as existing_checkers
 
 from foris_schema import ForisValidator
+from foris_schema import custom_format_checkers
 
 
 @pytest.fixture(scope="module")
@@ -148,3 +154,82 @@ def test_macaddress(validator):
                 "module": "custom_format_checkers", "kind": "request", "action": "macaddress",
                 "data": {"item": item}
             })
+
+
+# original implementation of the checkers, the current ones must give the same results
+reference_checker = FormatChecker()
+
+
+@reference_checker.checks("ipv4netmask", (socket.error, TypeError))
+def reference_ipv4netmask(value):
+    addr = socket.inet_aton(value)
+    addr_int = struct.unpack(">I", addr)[0]
+    bin_repr = "{:032b}".format(addr_int)
+    return "0" not in bin_repr.rstrip("0")
+
+
+@reference_checker.checks("ipv4prefix", (socket.error, ValueError, AttributeError))
+def reference_ipv4prefix(value):
+    address, prefix = value.rsplit("/", 1)
+    prefix_num = int(prefix)
+    return existing_checkers.is_ipv4(address) and 0 <= prefix_num and prefix_num <= 32
+
+
+@reference_checker.checks("ipv6prefix", (socket.error, ValueError, AttributeError))
+def reference_ipv6prefix(value):
+    address, prefix = value.rsplit("/", 1)
+    prefix_num = int(prefix)
+    return existing_checkers.is_ipv6(address) and 0 <= prefix_num and prefix_num <= 128
+
+
+@reference_checker.checks("macaddress", (ValueError, TypeError))
+def reference_macaddress(value):
+    return True if re.match(custom_format_checkers.MAC_RE, value) else False
+
+
+VALUES = [
+    None, 0, 1, 1.5, True, [], {}, b"255.0.0.0", "", "/", "//", "/32", "1/", " ",
+    "0.0.0.0", "255.255.255.255", "255.255.255.254", "255.255.255.253", "128.0.0.0",
+    "255.0.0.0", "255.128.0.0", "255.252.0.0", "255.253.0.0", "0.0.0.255", "1.0.0.0",
+    "192.168.1.1", "10.0.0.0", "255", "0xff.0.0.0", "0377.0.0.0", "255.255", "255.255.0",
+    "255.255.255.0 ", " 255.255.255.0", "255.255.255.0\n", "256.0.0.0", "255.0.0.0.0",
+    "192.168.1.1/32", "192.168.1.1/0", "192.168.1.1/33", "192.168.1.1/-0", "192.168.1.1/+8",
+    "192.168.1.1/ 8", "192.168.1.1/8 ", "192.168.1.1/0x8", "192.168.1.1/3_2", "192.168.1.1/\u0663",
+    "192.168.1.1/", "192.168.1.1//8", "01.2.3.4/8", "1.2.3.04/8", "1.2.3/8", "1.2.3.4.5/8",
+    "\u0661.2.3.4/8", "1.2.3.4\n/8", "255.255.255.255/32", "0.0.0.0/0", "300.1.1.1/8",
+    "::/128", "::/0", "::1/64", "::/129", "::/-1", "::1", "x::/64", "fe80::1%eth0/64",
+    "fe80::1/64", "::ffff:1.2.3.4/96", "1:2:3:4:5:6:7:8/64", "1:2:3:4:5:6:7:8:9/64",
+    "::ffff:01.2.3.4/96", ":::/64", "1::2::3/64",
+    "d8:9e:f3:73:05:9c", "D8:9E:F3:73:05:9C", "d8:9e:f3:g3:05:9c", "d8:9e:f3:73:05",
+    "d8-9e-f3-73-05-9c", "d8:9e:f3:73:05:9c:11", "d8:9e:f3:73:05:9c\n", "d8:9e:f3:73:05:9c ",
+    "\u0661\u0661:9e:f3:73:05:9c",
+]
+
+
+def _outcome(checker, value, format):
+    try:
+        return checker.conforms(value, format)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("format", ["ipv4netmask", "ipv4prefix", "ipv6prefix", "macaddress"])
+def test_same_as_reference(format):
+    for _ in range(2):  # the second round uses the cached results
+        for value in VALUES:
+            assert _outcome(custom_format_checkers.format_checker, value, format) == \
+                _outcome(reference_checker, value, format), value
+
+
+def test_cache():
+    checker = custom_format_checkers.check_macaddress
+    checker.cache_clear()
+    assert checker("d8:9e:f3:73:05:9c")
+    assert checker("d8:9e:f3:73:05:9c")
+    assert not checker("d8:9e:f3:73:05")
+    info = checker.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+    with pytest.raises(TypeError):
+        checker(None)  # other values are not cached
+    assert checker.cache_info().currsize == 2
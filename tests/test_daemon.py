@@ -0,0 +1,159 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+from subprocess import PIPE
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.cli.daemon import DaemonUnavailable, ValidationServer, validate_remote
+
+
+SIMPLE_SCHEMA = "./tests/schemas/modules/simple"
+VALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": False}}
+INVALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": False},
+           "extra": "YES"}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "foris-schema.sock")
+    validator = ForisValidator([SIMPLE_SCHEMA])
+    server = ValidationServer(socket_path, validator, [SIMPLE_SCHEMA], [])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_validate_remote(daemon):
+    assert validate_remote(daemon, [SIMPLE_SCHEMA], [], VALID) == (True, None)
+    valid, error = validate_remote(daemon, [SIMPLE_SCHEMA], [], INVALID)
+    assert not valid
+    assert "Failed validating 'additionalProperties' in schema:" in error
+
+
+def test_different_schemas(daemon):
+    with pytest.raises(DaemonUnavailable):
+        validate_remote(daemon, ["tests/schemas/modules/definitions"], [], VALID)
+
+
+def test_not_running(tmp_path):
+    with pytest.raises(DaemonUnavailable):
+        validate_remote(str(tmp_path / "missing.sock"), [SIMPLE_SCHEMA], [], VALID)
+
+
+def test_reload(tmp_path):
+    schema_path = str(tmp_path / "modules")
+    shutil.copytree(SIMPLE_SCHEMA, schema_path)
+    socket_path = str(tmp_path / "foris-schema.sock")
+    server = ValidationServer(socket_path, ForisValidator([schema_path]), [schema_path], [])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert validate_remote(socket_path, [schema_path], [], VALID) == (True, None)
+
+        path = os.path.join(schema_path, "simple.json")
+        with open(path) as f:
+            schema = json.load(f)
+        schema["oneOf"] = [
+            e for e in schema["oneOf"] if e["properties"]["kind"]["enum"] != ["reply"]]
+        with open(path, "w") as f:
+            json.dump(schema, f)
+        os.utime(path, ns=(0, 10 ** 9))
+        assert validate_remote(socket_path, [schema_path], [], VALID)[0] is False
+
+        with open(path, "a") as f:
+            f.write("{")
+        with pytest.raises(DaemonUnavailable):
+            validate_remote(socket_path, [schema_path], [], VALID)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_client_imports():
+    code = "import sys, foris_schema.cli.__main__; print('jsonschema' in sys.modules)"
+    ret = subprocess.run([sys.executable, "-c", code], stdout=PIPE, check=True)
+    assert ret.stdout.strip() == b"False"
+
+
+def test_socket_lifecycle(tmp_path):
+    socket_path = str(tmp_path / "foris-schema.sock")
+    validator = ForisValidator([SIMPLE_SCHEMA])
+
+    # stale socket file is replaced
+    ValidationServer(socket_path, validator, [SIMPLE_SCHEMA], []).socket.close()
+    assert os.path.exists(socket_path)
+    server = ValidationServer(socket_path, validator, [SIMPLE_SCHEMA], [])
+
+    with pytest.raises(RuntimeError):
+        ValidationServer(socket_path, validator, [SIMPLE_SCHEMA], [])
+
+    server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_not_socket(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("notes")
+    with pytest.raises(RuntimeError):
+        ValidationServer(str(path), ForisValidator([SIMPLE_SCHEMA]), [SIMPLE_SCHEMA], [])
+    assert path.read_text() == "notes"
+
+
+@pytest.mark.parametrize('msg,retval', [(VALID, 0), (INVALID, 1)])
+def test_cli_client(daemon, msg, retval):
+    command = ['foris-schema', '--socket', daemon, SIMPLE_SCHEMA, '-r', json.dumps(msg)]
+    ret = subprocess.run(command, stdin=None, stderr=PIPE)
+    assert ret.returncode == retval
+    if retval:
+        assert b"Failed validating 'additionalProperties' in schema:" in ret.stderr
+
+
+@pytest.mark.parametrize('msg,retval', [(VALID, 0), (INVALID, 1)])
+def test_cli_fallback(tmp_path, msg, retval):
+    socket_path = str(tmp_path / "missing.sock")
+    command = ['foris-schema', '--socket', socket_path, SIMPLE_SCHEMA, '-r', json.dumps(msg)]
+    ret = subprocess.run(command, stdin=None, stderr=PIPE)
+    assert ret.returncode == retval
+    if retval:
+        assert b"Failed validating 'additionalProperties' in schema:" in ret.stderr
+
+
+def test_cli_serve(tmp_path):
+    socket_path = str(tmp_path / "foris-schema.sock")
+    process = subprocess.Popen(['foris-schema', '--serve', socket_path, SIMPLE_SCHEMA])
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            threading.Event().wait(0.05)
+        assert validate_remote(socket_path, [SIMPLE_SCHEMA], [], VALID) == (True, None)
+    finally:
+        process.terminate()
+        process.wait()
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,195 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import math
+import subprocess
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema import decoder as decoder_module
+from foris_schema.decoder import (
+    JsonDecoder, available_decoders, get_decoder, leading_members, unique_members,
+)
+from foris_schema.validator import ForisSchemaValidationError, ForisValidationError
+
+
+DOCUMENTS = [
+    '{"a": [1, 2.5, -3e2, true, false, null], "b": {"c": "d\\u00e9\\n"}}',
+    '[]',
+    '"string"',
+    '18446744073709551616',  # bigger than 64 bits
+    '[-9223372036854775809, 9223372036854775807, 1.00000000000000000001]',
+    '[1e400, -0, -0.0, 1E5, 0.1, 5e-324]',
+    '[NaN, Infinity, -Infinity]',
+    '"\\ud800"',  # lone surrogate
+    ' {"a": 1} \n',
+    '{"a": 1, "a": 2}',
+]
+
+INVALID = ['', '{', '{"a": 1,}', "{'a': 1}", '[1] [2]', 'key: value']
+
+
+@pytest.fixture(params=available_decoders())
+def decoder(request):
+    return get_decoder(request.param)
+
+
+def _same(a, b):
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(_same, a, b))
+    return type(a) is type(b) and a == b
+
+
+def test_get_decoder():
+    assert get_decoder("json").name == "json"
+    default = get_decoder()
+    assert default.name == ("orjson" if decoder_module.orjson is not None else "json")
+    instance = JsonDecoder()
+    assert get_decoder(instance) is instance
+    with pytest.raises(ValueError):
+        get_decoder("unknown")
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_loads(decoder, document):
+    expected = json.loads(document)
+    assert _same(decoder.loads(document), expected)
+    assert _same(decoder.loads(document.encode()), expected)
+
+
+@pytest.mark.parametrize("document", INVALID)
+def test_invalid(decoder, document):
+    with pytest.raises(json.JSONDecodeError) as excinfo:
+        decoder.loads(document)
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(document)
+    assert str(excinfo.value) == str(expected.value)
+
+
+def test_load_file(decoder, tmpdir):
+    path = tmpdir.join("file.json")
+    path.write_text('{"a": ["é", 1]}', encoding="utf-8")
+    assert decoder.load_file(str(path)) == {"a": ["é", 1]}
+    path.write_text('{"a": ', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        decoder.load_file(str(path))
+
+
+def test_encoding(decoder, tmpdir):
+    path = tmpdir.join("file.json")
+    path.write_binary(b'\xef\xbb\xbf{"a": 1}')
+    for load in (decoder.load_file, lambda path: decoder.loads(path.read_binary())):
+        with pytest.raises(json.JSONDecodeError) as excinfo:
+            load(path)
+        assert "BOM" in str(excinfo.value)
+    for data in ('{"a": "\u00e9"}'.encode("utf-16"), b'{"a": "\xe9"}'):
+        with pytest.raises(UnicodeDecodeError):
+            decoder.loads(data)
+
+    module = tmpdir.mkdir("modules").join("simple.json")
+    with open("tests/schemas/modules/simple/simple.json", "rb") as f:
+        module.write_binary(b"\xef\xbb\xbf" + f.read())
+    with pytest.raises(ForisSchemaValidationError):
+        ForisValidator([str(module.dirname)], decoder=decoder)
+
+
+def test_validator(decoder):
+    validator = ForisValidator(
+        ["tests/schemas/modules/definitions-external/"],
+        ["tests/schemas/definitions/definitions-external/"],
+        decoder=decoder,
+    )
+    assert validator.decoder is decoder
+    reference = ForisValidator(
+        ["tests/schemas/modules/definitions-external/"],
+        ["tests/schemas/definitions/definitions-external/"],
+        decoder="json",
+    )
+    assert validator.get_module_schema("definitions-external") == \
+        reference.get_module_schema("definitions-external")
+
+
+def test_validator_errors(decoder, tmpdir):
+    with pytest.raises(ForisSchemaValidationError) as excinfo:
+        ForisValidator(["tests/schemas/modules/wrong_schema/invalid_json/"], decoder=decoder)
+    assert "JSONDecodeError" in str(excinfo.value)
+
+    tmpdir.join("broken.json").write("{")
+    with pytest.raises(ForisValidationError) as excinfo:
+        ForisValidator(["tests/schemas/modules/simple/"], [str(tmpdir)], decoder=decoder)
+    assert "JSONDecodeError" in str(excinfo.value)
+
+
+def test_cli(decoder):
+    res = subprocess.run(
+        [
+            "foris-schema", "--json-decoder", decoder.name, "tests/schemas/modules/simple",
+            "-r", '{"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}}',
+        ],
+        stderr=subprocess.PIPE,
+    )
+    assert res.returncode == 1
+    assert b"ValidationError" in res.stderr
+
+
+@pytest.mark.parametrize("payload, members", [
+    ('{"module": "simple", "kind": "reply", "action": "get", "data": {}}',
+     {"module": "simple", "kind": "reply", "action": "get"}),
+    (' {\n"kind" :"reply","module":"a\\u00e9","data":{', {"kind": "reply", "module": "aé"}),
+    ('{"module": "a", "module": "b", "data": 1}', {"module": "b"}),
+    ('{"data": {}, "module": "simple"}', {}),
+    ('{"module": {"a": [1]}, "kind": null}', {"module": {"a": [1]}, "kind": None}),
+    ('{"module": "unterminated', {}),
+    ('{"module": "a" "kind": "b"}', {"module": "a"}),
+    ('{}', {}),
+    ('[{"module": "simple"}]', None),
+    ('"module"', None),
+    ('', None),
+])
+def test_leading_members(payload, members):
+    names = {"module", "kind", "action"}
+    assert leading_members(payload, names) == members
+    assert leading_members(payload.encode(), names) == members
+
+
+def test_leading_members_limit():
+    payload = '{"module": "%s", "kind": "reply"}' % ("a" * 2000)
+    assert leading_members(payload, {"module", "kind"}) == {}
+    assert leading_members(payload, {"module", "kind"}, limit=4096) == {
+        "module": "a" * 2000, "kind": "reply"}
+    # multibyte character split by the limit
+    payload = '{"kind": "reply", "module": "%s"}' % ("é" * 100)
+    assert leading_members(payload.encode(), {"module", "kind"}, limit=50) == {"kind": "reply"}
+
+
+@pytest.mark.parametrize("payload,unique", [
+    ('{"module": "x", "kind": "reply", "data": {"a": "\\u0161"}}', True),
+    ('{"module": "x", "data": {"module": 1}}', False),
+    ('{"module": "x", "data": {}, "module": "simple"}', False),
+    ('{"module": "x", "data": {}, "\\u006dodule": "simple"}', False),
+    ('{"module": "x", "data": {}, "\\u006Dodule": "simple"}', False),
+    ('{"module": "module"}', False),
+])
+def test_unique_members(payload, unique):
+    names = {"module", "kind", "action"}
+    assert json.loads(payload)
+    assert unique_members(payload, names) == unique
+    assert unique_members(payload.encode(), names) == unique
+    assert unique_members(bytearray(payload.encode()), names) == unique
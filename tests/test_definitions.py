@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+
 import pytest
 
 from jsonschema import ValidationError
@@ -192,3 +194,20 @@ def test_two_modules_with_same_definition():
         "action": "get",
         "data": {"msg": "AAAAAA"},
     })
+
+
+def test_unused_definitions_pruned(tmpdir):
+    with open("tests/schemas/definitions/definitions-external/definitions-external.json") as f:
+        definitions = json.load(f)
+    definitions["definitions"]["unused"] = {"$ref": "#/definitions/lower"}
+    tmpdir.join("definitions.json").write(json.dumps(definitions))
+
+    validator = ForisValidator(
+        ["tests/schemas/modules/simple/", "tests/schemas/modules/definitions-external/"],
+        [str(tmpdir)],
+    )
+    assert set(validator.definitions) == {"lower", "lower_object", "unused"}
+    assert validator.get_module_schema("simple")["definitions"] == {}
+    schema = validator.get_module_schema("definitions-external")
+    # lower is used only through lower_object
+    assert list(schema["definitions"]) == ["lower", "lower_object"]
@@ -0,0 +1,77 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+
+from collections import OrderedDict
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+
+
+MISSING = object()
+
+VALUES = [MISSING, "simple", "request", "reply", "get", "unknown", "", None, 1, True, [], {}]
+
+
+def _messages():
+    for module, kind, action in itertools.product(VALUES, repeat=3):
+        msg = {}
+        for key, value in (("module", module), ("kind", kind), ("action", action)):
+            if value is not MISSING:
+                msg[key] = value
+        yield msg
+
+    base = {"module": "simple", "kind": "reply", "action": "get"}
+    for value in [None, 1, 1.0, True, "", [], [1], {}, {"a": 1}, ()]:
+        yield dict(base, data=value)
+        yield dict(base, errors=value)
+    yield dict(base, extra=1)
+    yield dict(base, **{"1": 1})
+    yield {1: 1, **base}
+    yield OrderedDict(base)
+    yield [base]
+    yield "simple"
+    yield None
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return ForisValidator(["tests/schemas/modules/simple/"])
+
+
+def test_same_as_base_validator(validator):
+    count = 0
+    for msg in _messages():
+        assert validator.envelope_check(msg) == validator.base_validator.is_valid(msg), msg
+        count += 1
+    assert count > 1000
+
+
+def test_no_modules(tmpdir):
+    validator = ForisValidator([str(tmpdir)])
+    msg = {"module": "simple", "kind": "reply", "action": "get"}
+    assert not validator.envelope_check(msg)
+    assert not validator.base_validator.is_valid(msg)
+
+
+def test_detailed_error(validator):
+    with pytest.raises(ValidationError) as excinfo:
+        validator.validate({"module": "simple", "kind": "answer", "action": "get"})
+    assert "'answer' is not one of ['request', 'reply', 'notification']" in str(excinfo.value)
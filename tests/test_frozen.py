@@ -0,0 +1,145 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.frozen import FrozenDict, FrozenList, freeze
+
+
+MODULES = ["tests/schemas/modules/definitions-external/"]
+DEFINITIONS = ["tests/schemas/definitions/definitions-external/"]
+
+
+@pytest.fixture(params=["loaded", "cached", "lazy"])
+def validator(request, tmpdir):
+    if request.param == "loaded":
+        return ForisValidator(MODULES, DEFINITIONS)
+    elif request.param == "cached":
+        ForisValidator(MODULES, DEFINITIONS, cache_dir=str(tmpdir))
+        return ForisValidator(MODULES, DEFINITIONS, cache_dir=str(tmpdir))
+    elif request.param == "lazy":
+        return ForisValidator(MODULES, DEFINITIONS, lazy=True)
+
+
+@pytest.mark.parametrize("modify", [
+    lambda d: d.__setitem__("a", 1),
+    lambda d: d.__delitem__("x"),
+    lambda d: d.update({"a": 1}),
+    lambda d: d.setdefault("a", 1),
+    lambda d: d.pop("x"),
+    lambda d: d.popitem(),
+    lambda d: d.clear(),
+    lambda d: d["x"]["y"].append(3),
+    lambda d: d["x"]["y"].extend([3]),
+    lambda d: d["x"]["y"].insert(0, 3),
+    lambda d: d["x"]["y"].__setitem__(0, 3),
+    lambda d: d["x"]["y"].sort(),
+    lambda d: d["x"]["y"].pop(),
+])
+def test_read_only(modify):
+    frozen = freeze({"x": {"y": [1, 2]}})
+    with pytest.raises(TypeError):
+        modify(frozen)
+    assert frozen == {"x": {"y": [1, 2]}}
+
+
+def test_augmented_assignment():
+    frozen = freeze({"x": [1]})
+    with pytest.raises(TypeError):
+        frozen |= {"a": 1}
+    x = frozen["x"]
+    with pytest.raises(TypeError):
+        x += [2]
+    with pytest.raises(TypeError):
+        x *= 2
+    assert frozen == {"x": [1]}
+
+
+def test_freeze():
+    shared = {"type": "string"}
+    original = {"a": shared, "b": [shared, 1, "c", None]}
+    frozen = freeze(original)
+    assert frozen == original
+    assert isinstance(frozen, FrozenDict) and isinstance(frozen["b"], FrozenList)
+    assert frozen["a"] is frozen["b"][0]
+    assert freeze(frozen) is frozen
+
+    original["a"]["type"] = "integer"
+    assert frozen["a"] == {"type": "string"}
+
+
+def test_deepcopy():
+    frozen = freeze({"a": {"b": [1, {"c": 2}]}, "d": []})
+    result = copy.deepcopy(frozen)
+    assert result == frozen
+    assert type(result) is dict and type(result["a"]["b"]) is list
+    assert type(result["a"]["b"][1]) is dict
+    result["a"]["b"].append(3)
+    assert frozen["a"]["b"] == [1, {"c": 2}]
+
+    assert type(copy.copy(frozen)) is dict
+
+
+def test_pickle():
+    frozen = freeze({"a": [1, {"b": 2}]})
+    result = pickle.loads(pickle.dumps(frozen))
+    assert result == frozen
+    assert isinstance(result, FrozenDict) and isinstance(result["a"][1], FrozenDict)
+
+
+def test_to_json():
+    frozen = freeze({"a": [1, {"b": "c"}]})
+    assert json.loads(frozen.to_json()) == frozen
+    assert frozen.to_json() is frozen.to_json()
+    assert json.loads(frozen["a"].to_json()) == [1, {"b": "c"}]
+
+
+def test_validator_schemas(validator):
+    base_schema = validator.base_schema
+    assert base_schema is validator.base_schema
+    assert base_schema["properties"]["module"]["enum"] == ["definitions-external"]
+    with pytest.raises(TypeError):
+        base_schema["properties"]["module"]["enum"].append("other")
+
+    assert validator.error_schema is validator.error_schema
+    with pytest.raises(TypeError):
+        validator.error_schema["required"] = []
+
+    schema = validator.get_module_schema("definitions-external")
+    assert schema is validator.get_module_schema("definitions-external")
+    with pytest.raises(TypeError):
+        schema["oneOf"][0]["properties"]["data"] = {}
+    assert json.loads(schema.to_json()) == schema
+
+    # global definitions are shared, not copied
+    for name, definition in validator.definitions.items():
+        assert isinstance(definition, FrozenDict)
+        if name in schema["definitions"]:
+            assert schema["definitions"][name] is definition
+
+    mutable = copy.deepcopy(schema)
+    mutable["oneOf"] = []
+    assert schema["oneOf"]
+
+    validator.validate({
+        "module": "definitions-external", "kind": "request", "action": "get",
+        "data": {"object1": {"substring": "abc"}, "string1": "abc"},
+    })
@@ -0,0 +1,103 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.validator import (
+    SchemaErrorMutipleTypes,
+    ModuleAlreadyLoaded,
+    ForisSchemaValidationError
+)
+
+
+SCHEMA_PATHS = [
+    "tests/schemas/modules/simple/",
+    "tests/schemas/modules/definitions/",
+    "tests/schemas/modules/custom_format_checkers/",
+]
+
+
+@pytest.fixture
+def validator():
+    return ForisValidator(SCHEMA_PATHS, lazy=True)
+
+
+def test_modules_not_loaded(validator):
+    assert validator.validators == {}
+    assert validator.base_schema["properties"]["module"]["enum"] == \
+        ["simple", "definitions", "custom_format_checkers"]
+
+
+def test_load_on_use(validator):
+    assert validator.is_valid({"module": "simple", "kind": "request", "action": "get"})
+    assert set(validator.validators) == {"simple"}
+
+    with pytest.raises(ValidationError):
+        validator.validate({"module": "definitions", "kind": "request", "action": "get"})
+    assert set(validator.validators) == {"simple", "definitions"}
+
+    assert validator.get_module_schema("custom_format_checkers")["oneOf"]
+    assert set(validator.validators) == {"simple", "definitions", "custom_format_checkers"}
+
+
+def test_unknown_module(validator):
+    with pytest.raises(ValidationError):
+        validator.validate({"module": "non-existing", "kind": "request", "action": "get"})
+    assert not validator.is_valid({"module": "non-existing", "kind": "request", "action": "get"})
+    assert validator.validators == {}
+
+
+def test_same_results(validator):
+    eager = ForisValidator(SCHEMA_PATHS)
+    messages = [
+        {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}},
+        {"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}},
+        {"module": "custom_format_checkers", "kind": "request", "action": "macaddress",
+         "data": {"item": "00:11:22:33:44:55"}},
+        {"module": "custom_format_checkers", "kind": "request", "action": "macaddress",
+         "data": {"item": "00:11:22:33:44"}},
+    ]
+    for msg in messages:
+        assert validator.is_valid(msg) == eager.is_valid(msg)
+
+
+@pytest.mark.parametrize('schema, module, exception', [
+    ("tests/schemas/modules/wrong_schema/properties/", "properties", ForisSchemaValidationError),
+    ("tests/schemas/modules/wrong_schema/mandatory/", "mandatory", ForisSchemaValidationError),
+    ("tests/schemas/modules/wrong_schema/mismatched/", "mismatched", ForisSchemaValidationError),
+    ("tests/schemas/modules/wrong_schema/multiple/", "multiple", SchemaErrorMutipleTypes),
+    ("tests/schemas/modules/wrong_schema/invalid_json/", "invalid", ForisSchemaValidationError),
+])
+def test_errors(schema, module, exception):
+    with pytest.raises(exception) as eager_excinfo:
+        ForisValidator([schema])
+
+    validator = ForisValidator([schema], lazy=True)
+    for _ in range(2):
+        with pytest.raises(exception) as excinfo:
+            validator.is_valid({"module": module, "kind": "request", "action": "get"})
+        assert str(excinfo.value) == str(eager_excinfo.value)
+
+
+def test_already_loaded():
+    with pytest.raises(ModuleAlreadyLoaded):
+        ForisValidator([
+            "tests/schemas/modules/wrong_schema/same1/",
+            "tests/schemas/modules/wrong_schema/same2/",
+        ], lazy=True)
@@ -0,0 +1,119 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.metrics import ValidationMetrics
+
+
+KEY = ("simple", "reply", "get")
+VALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}}
+INVALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}}
+ERROR = {
+    "module": "simple", "kind": "reply", "action": "get",
+    "errors": [{"description": "failed", "stacktrace": ""}],
+}
+
+
+@pytest.fixture(params=[False, True], ids=["jsonschema", "compiled"])
+def validator(request):
+    return ForisValidator(
+        ["tests/schemas/modules/simple/"], compiled=request.param, metrics=ValidationMetrics())
+
+
+def test_disabled():
+    validator = ForisValidator(["tests/schemas/modules/simple/"])
+    assert validator.metrics is None
+    assert "_validate" not in vars(validator)
+    validator.validate(VALID)
+
+
+def test_validate(validator):
+    validator.validate(VALID)
+    validator.validate(ERROR)
+    with pytest.raises(ValidationError):
+        validator.validate(INVALID)
+
+    stats = validator.metrics.snapshot()[KEY]
+    assert (stats["valid"], stats["invalid"], stats["error"]) == (1, 1, 1)
+    assert sum(stats["histogram"]) == 3
+    assert stats["time"] > 0
+    # only the invalid message goes through the verbose path
+    assert stats["verbose_count"] == 1
+    assert 0 < stats["verbose_time"] <= stats["time"]
+
+
+def test_is_valid(validator):
+    assert validator.is_valid(VALID)
+    assert validator.is_valid(ERROR)
+    assert not validator.is_valid(INVALID)
+    assert not validator.is_valid({"module": "unknown", "kind": "reply", "action": "get"})
+    assert not validator.is_valid([])
+
+    snapshot = validator.metrics.snapshot()
+    stats = snapshot[KEY]
+    assert (stats["valid"], stats["invalid"], stats["error"]) == (1, 1, 1)
+    assert stats["verbose_count"] == 0
+    assert snapshot[("unknown", "reply", "get")]["invalid"] == 1
+    assert snapshot[(None, None, None)]["invalid"] == 1
+
+
+def test_validate_many(validator):
+    results = validator.validate_many([VALID, INVALID, ERROR, {"module": "simple"}])
+    assert [e.valid for e in results] == [True, False, True, False]
+    snapshot = validator.metrics.snapshot()
+    stats = snapshot[KEY]
+    assert (stats["valid"], stats["invalid"], stats["error"]) == (1, 1, 1)
+    assert snapshot[("simple", None, None)]["invalid"] == 1
+
+
+def test_callbacks_and_reset(validator):
+    events = []
+    validator.metrics.add_callback(lambda key, event, duration: events.append((key, event)))
+    validator.validate(VALID)
+    with pytest.raises(ValidationError):
+        validator.validate(INVALID)
+    assert events == [(KEY, "valid"), (KEY, "verbose"), (KEY, "invalid")]
+
+    last = validator.metrics.reset()
+    assert last[KEY]["valid"] == 1
+    assert validator.metrics.snapshot() == {}
+
+
+def test_snapshot_is_copy(validator):
+    validator.validate(VALID)
+    snapshot = validator.metrics.snapshot()
+    snapshot[KEY]["histogram"][0] += 100
+    validator.validate(VALID)
+    assert sum(validator.metrics.snapshot()[KEY]["histogram"]) == 2
+
+
+def test_histogram_buckets():
+    metrics = ValidationMetrics(buckets=[0.1, 1.0])
+    for duration in (0.05, 0.1, 0.5, 2.0):
+        metrics.record(KEY, "valid", duration)
+    assert metrics.snapshot()[KEY]["histogram"] == [2, 1, 1]
+
+
+def test_result_cache_hits_not_recorded():
+    validator = ForisValidator(
+        ["tests/schemas/modules/simple/"], result_cache_size=8, metrics=ValidationMetrics())
+    for _ in range(3):
+        validator.is_valid(VALID)
+    assert validator.metrics.snapshot()[KEY]["valid"] == 1
@@ -0,0 +1,96 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.validator import (
+    ForisSchemaValidationError, ModuleAlreadyLoaded, SchemaErrorMutipleTypes,
+)
+
+
+SCHEMA_PATHS = [
+    "tests/schemas/modules/simple/",
+    "tests/schemas/modules/definitions-external/",
+    "tests/schemas/modules/override_definition/",
+    "tests/schemas/modules/keywords/",
+]
+DEFINITIONS_PATHS = ["tests/schemas/definitions/definitions-external/"]
+
+
+def test_same_schemas():
+    sequential = ForisValidator(SCHEMA_PATHS, DEFINITIONS_PATHS)
+    parallel = ForisValidator(SCHEMA_PATHS, DEFINITIONS_PATHS, load_workers=2)
+
+    assert parallel.definitions == sequential.definitions
+    assert list(parallel.validators) == list(sequential.validators)
+    for module_name in sequential.validators:
+        schema = parallel.get_module_schema(module_name)
+        assert schema == sequential.get_module_schema(module_name)
+        assert json.dumps(schema) == json.dumps(sequential.get_module_schema(module_name))
+        for name, definition in parallel.definitions.items():
+            if name in schema["definitions"] and name != "msg":  # msg is overridden
+                assert schema["definitions"][name] is definition
+
+
+def test_cache(tmpdir):
+    ForisValidator(SCHEMA_PATHS, DEFINITIONS_PATHS, cache_dir=str(tmpdir), load_workers=2)
+    cached = ForisValidator(SCHEMA_PATHS, DEFINITIONS_PATHS, cache_dir=str(tmpdir))
+    assert cached.get_module_schema("simple") == ForisValidator(
+        SCHEMA_PATHS, DEFINITIONS_PATHS).get_module_schema("simple")
+
+
+@pytest.mark.parametrize("schema_paths, exception, text", [
+    (["tests/schemas/modules/wrong_schema/properties/"], ForisSchemaValidationError,
+     "ValidationError"),
+    (["tests/schemas/modules/wrong_schema/invalid_json/"], ForisSchemaValidationError,
+     "JSONDecodeError"),
+    (["tests/schemas/modules/wrong_schema/multiple/"], SchemaErrorMutipleTypes, ""),
+    (
+        ["tests/schemas/modules/wrong_schema/same1/", "tests/schemas/modules/wrong_schema/same2/"],
+        ModuleAlreadyLoaded, "",
+    ),
+])
+def test_same_errors(schema_paths, exception, text):
+    with pytest.raises(exception) as sequential:
+        ForisValidator(schema_paths)
+    with pytest.raises(exception) as parallel:
+        ForisValidator(schema_paths, load_workers=2)
+    assert str(parallel.value) == str(sequential.value)
+    assert text in repr(parallel.value)
+
+
+def test_first_error_in_file_order(tmpdir):
+    # an invalid file followed by a duplicate module: the invalid file is reported
+    # no matter which worker finishes first
+    first, second = str(tmpdir.mkdir("first")), str(tmpdir.mkdir("second"))
+    shutil.copy("tests/schemas/modules/simple/simple.json", os.path.join(second, "simple.json"))
+    with open(os.path.join(first, "simple.json"), "w") as f:
+        f.write("{")
+    for _ in range(3):
+        with pytest.raises(ForisSchemaValidationError):
+            ForisValidator([first, second], load_workers=2)
+
+    # duplicate module reported before an invalid module in a later file
+    third = str(tmpdir.mkdir("third"))
+    with open(os.path.join(third, "broken.json"), "w") as f:
+        f.write("{")
+    with pytest.raises(ModuleAlreadyLoaded):
+        ForisValidator([second, second, third], load_workers=2)
@@ -0,0 +1,59 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.pool import ForisValidatorPool
+
+
+MESSAGES = [
+    {"module": "simple", "kind": "request", "action": "get"},
+    {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}},
+    {"module": "simple", "kind": "reply", "action": "get", "data": {"result": "x"}},
+    {"module": "non-existing", "kind": "request", "action": "get"},
+    {"module": "simple", "kind": "reply", "action": "get",
+     "errors": [{"description": "failed", "stacktrace": ""}]},
+]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ForisValidatorPool(["tests/schemas/modules/simple/"], workers=2, chunk_size=3) as pool:
+        yield pool
+
+
+def test_results_in_order(pool):
+    validator = ForisValidator(["tests/schemas/modules/simple/"])
+    messages = MESSAGES * 20
+    expected = validator.validate_many(messages)
+    results = pool.validate_many(messages)
+    assert [r.valid for r in results] == [r.valid for r in expected]
+    assert [r.error_message for r in results] == [r.error_message for r in expected]
+    for result, expected_result in zip(results, expected):
+        if expected_result.error is not None:
+            assert str(result.error) == str(expected_result.error)
+            assert result.error.path == expected_result.error.path
+
+
+def test_iter_validate(pool):
+    results = pool.iter_validate(iter(MESSAGES), errors=False)
+    assert [(r.valid, r.error) for r in results] == [
+        (True, None), (True, None), (False, None), (False, None), (True, None)]
+
+
+def test_empty(pool):
+    assert pool.validate_many([]) == []
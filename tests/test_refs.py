@@ -0,0 +1,163 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import Draft7Validator
+
+from foris_schema import ForisValidator
+from foris_schema.custom_format_checkers import format_checker
+from foris_schema.refs import (
+    definition_name, inline_refs, referenced_definitions, resolve_refs, validator_class,
+)
+
+from .test_compiler import SCHEMA_SETS, _messages
+
+
+def _errors(validator, msg):
+    return [
+        (str(e), list(e.absolute_path), list(e.absolute_schema_path))
+        for e in validator.iter_errors(msg)
+    ]
+
+
+@pytest.mark.parametrize("schema_paths,definitions_paths", SCHEMA_SETS)
+def test_same_errors(schema_paths, definitions_paths):
+    validator = ForisValidator(schema_paths, definitions_paths)
+    plain = {
+        key: Draft7Validator(e.schema, format_checker=format_checker)
+        for key, e in validator.action_validators.items()
+    }
+    modules = {
+        name: Draft7Validator(e.schema, format_checker=format_checker)
+        for name, e in validator.validators.items()
+    }
+
+    checked = 0
+    for msg in _messages(validator):
+        key = (msg["module"], msg["kind"], msg["action"])
+        assert validator.action_checks[key](msg) == plain[key].is_valid(msg), msg
+        assert _errors(validator.action_validators[key], msg) == _errors(plain[key], msg), msg
+        assert validator.is_valid(msg) == (
+            modules[msg["module"]].is_valid(msg)
+            or validator.error_validator.is_valid(msg)
+        ), msg
+        checked += 1
+    assert checked > 0
+
+
+@pytest.mark.parametrize("ref, name", [
+    ("#/definitions/a", "a"),
+    ("#/definitions/a~1b~0c", "a/b~c"),
+    ("#/definitions/a%20b", "a b"),
+    ("#/definitions/a/properties/b", None),
+    ("#/oneOf/0", None),
+    ("other.json#/definitions/a", None),
+    (None, None),
+])
+def test_definition_name(ref, name):
+    assert definition_name(ref) == name
+
+
+def test_inline():
+    number = {"type": "number"}
+    schema = {
+        "definitions": {"number": number, "pair": {"items": [{"$ref": "#/definitions/number"}]}},
+        "properties": {
+            "a": {"$ref": "#/definitions/pair"},
+            "b": {"$ref": "#/definitions/number", "type": "string"},  # sibling is ignored
+            "c": {"enum": [{"$ref": "#/definitions/number"}]},
+        },
+    }
+    inlined = inline_refs(schema)
+    assert inlined == {
+        "properties": {
+            "a": {"items": [number]},
+            "b": number,
+            "c": {"enum": [{"$ref": "#/definitions/number"}]},
+        },
+    }
+    assert inlined["properties"]["b"] is inlined["properties"]["a"]["items"][0]  # shared
+    assert schema["properties"]["a"] == {"$ref": "#/definitions/pair"}  # not modified
+
+
+def test_inline_recursive():
+    schema = {
+        "definitions": {
+            "tree": {
+                "type": "object",
+                "properties": {"children": {"items": {"$ref": "#/definitions/tree"}}},
+            },
+        },
+        "properties": {"root": {"$ref": "#/definitions/tree"}},
+    }
+    inlined = inline_refs(schema)
+    assert inlined["definitions"] == {"tree": inlined["properties"]["root"]}
+    assert inlined["properties"]["root"]["properties"]["children"]["items"] == {
+        "$ref": "#/definitions/tree"}
+
+    validator = validator_class(schema)(inlined)
+    assert validator.is_valid({"root": {"children": [{"children": []}]}})
+    assert not validator.is_valid({"root": {"children": [{"children": [1]}]}})
+
+
+@pytest.mark.parametrize("schema", [
+    {"properties": {"a": {"$id": "x", "type": "string"}}},
+    {"properties": {"a": {"$ref": "#/properties/b"}, "b": {}}},
+])
+def test_not_inlined(schema):
+    assert inline_refs(schema) is None
+
+
+def test_missing_definition():
+    schema = {"properties": {"a": {"$ref": "#/definitions/missing"}}, "definitions": {}}
+    assert inline_refs(schema) == {"properties": {"a": {"$ref": "#/definitions/missing"}}}
+    assert resolve_refs(schema) == {}
+    assert validator_class(schema) is Draft7Validator
+
+
+def test_unresolved_ref():
+    schema = {
+        "definitions": {"a": {"type": "string"}},
+        "properties": {"a": {"$ref": "#/definitions/a"}, "b": {"$ref": "#/properties/a"}},
+    }
+    validator = validator_class(schema)(schema)
+    assert validator.is_valid({"a": "x", "b": "y"})
+    for msg in ({"a": 1}, {"b": 1}):
+        assert _errors(validator, msg) == _errors(Draft7Validator(schema), msg)
+
+
+def test_referenced_definitions():
+    schema = {
+        "definitions": {"local": {"$ref": "#/definitions/a~1b"}, "unused": {}},
+        "properties": {
+            "x": {"$ref": "#/definitions/local"},
+            "y": {"$ref": "#/definitions/c/properties/d"},
+            "z": {"$ref": "#/properties/x"},
+        },
+    }
+    definitions = {"a/b": {"$ref": "#/definitions/e"}, "c": {}, "e": {}, "f": {}}
+    assert referenced_definitions(schema, definitions) == {"local", "a/b", "c", "e"}
+    assert referenced_definitions(schema) == {"local", "a/b", "c"}
+
+
+@pytest.mark.parametrize("schema", [
+    {"properties": {"a": {"$ref": "other.json#/definitions/a"}}},
+    {"properties": {"a": {"$ref": "#/definitions"}}},
+    {"properties": {"a": {"$id": "http://example.com/a"}}},
+])
+def test_referenced_definitions_unknown(schema):
+    assert referenced_definitions(schema, {"a": {}}) is None
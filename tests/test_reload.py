@@ -0,0 +1,213 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+from foris_schema import ForisValidator
+from foris_schema.validator import ForisSchemaValidationError
+from foris_schema.watcher import SchemaWatcher
+
+from .conftest import EXTERNAL, SIMPLE
+
+
+NOTIFICATION = {
+    "module": "simple", "kind": "notification", "action": "triggered", "data": {"event": "x"},
+}
+
+
+def _rewrite(path, update):
+    with open(path) as f:
+        schema = json.load(f)
+    update(schema)
+    st = os.stat(path)
+    with open(path, "w") as f:
+        json.dump(schema, f)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+
+def _drop_notification(schema):
+    schema["oneOf"] = [e for e in schema["oneOf"] if e["properties"]["kind"]["enum"] != [
+        "notification"]]
+
+
+def _uppercase(schema):
+    schema["definitions"]["lower"]["pattern"] = "^[A-Z]+$"
+
+
+def _add_definition(schema):
+    schema["definitions"]["other"] = {"type": "integer"}
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def lazy(request):
+    return request.param
+
+
+def _result(added=(), removed=(), reloaded=()):
+    return {"added": list(added), "removed": list(removed), "reloaded": list(reloaded)}
+
+
+def test_unchanged(schema_dirs, lazy):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], lazy=lazy)
+    assert validator.reload() == _result()
+
+
+def test_changed_module(schema_dirs, lazy):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], lazy=lazy)
+    assert validator.is_valid(NOTIFICATION)
+    assert validator.is_valid(EXTERNAL)
+    external = validator.validators["definitions-external"]
+
+    _rewrite(os.path.join(schema_dirs[0], "simple.json"), _drop_notification)
+    assert validator.reload() == _result(reloaded=["simple"])
+    assert not validator.is_valid(NOTIFICATION)
+    assert validator.is_valid(SIMPLE)
+    assert validator.validators["definitions-external"] is external
+    assert set(validator.action_validators) == set(
+        ForisValidator([schema_dirs[0]], [schema_dirs[1]]).action_validators)
+    assert validator.reload() == _result()
+
+
+def test_added_and_removed_module(schema_dirs, lazy):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], lazy=lazy)
+    base_validator = validator.base_validator
+
+    shutil.copy("tests/schemas/modules/keywords/keywords.json", schema_dirs[0])
+    os.unlink(os.path.join(schema_dirs[0], "simple.json"))
+    assert validator.reload() == _result(added=["keywords"], removed=["simple"])
+    assert validator.base_validator is not base_validator
+    assert not validator.is_valid(SIMPLE)
+    assert "simple" not in validator.validators
+    assert validator.get_module_schema("keywords")
+    assert validator.is_valid(EXTERNAL)
+
+
+def test_changed_definition(schema_dirs, lazy):
+    shutil.copy("tests/schemas/modules/definitions/definitions.json", schema_dirs[0])
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], lazy=lazy)
+    validator.get_module_schema("simple")
+    validator.get_module_schema("definitions")  # uses only local definitions
+    assert validator.is_valid(EXTERNAL)
+    simple = validator.validators["simple"]
+
+    _rewrite(os.path.join(schema_dirs[1], "definitions-external.json"), _uppercase)
+    assert validator.reload() == _result(reloaded=["definitions-external"])
+    assert validator.validators["simple"] is simple
+    assert not validator.is_valid(EXTERNAL)
+    assert validator.is_valid(dict(EXTERNAL, data={
+        "object1": {"substring": "ABC"}, "string1": "ABC"}))
+
+    # unused definition
+    _rewrite(os.path.join(schema_dirs[1], "definitions-external.json"), _add_definition)
+    assert validator.reload() == _result()
+    assert "other" in validator.definitions
+
+
+def test_changed_definition_after_reload(schema_dirs, lazy):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], lazy=lazy)
+    assert validator.is_valid(EXTERNAL)
+
+    # modules which were kept hold the definitions loaded before
+    _rewrite(os.path.join(schema_dirs[1], "definitions-external.json"), _add_definition)
+    assert validator.reload() == _result()
+    _rewrite(os.path.join(schema_dirs[1], "definitions-external.json"), _uppercase)
+    assert validator.reload() == _result(reloaded=["definitions-external"])
+    assert not validator.is_valid(EXTERNAL)
+
+
+def test_failed_reload(schema_dirs):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]])
+    path = os.path.join(schema_dirs[0], "simple.json")
+    with open(path, "a") as f:
+        f.write("{")
+    with pytest.raises(ForisSchemaValidationError):
+        validator.reload()
+    assert validator.is_valid(NOTIFICATION)
+
+    os.unlink(path)
+    shutil.copy("tests/schemas/modules/simple/simple.json", schema_dirs[0])
+    _rewrite(path, _drop_notification)
+    assert validator.reload() == _result(reloaded=["simple"])
+    assert not validator.is_valid(NOTIFICATION)
+
+
+def test_result_cache_cleared(schema_dirs):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]], result_cache_size=16)
+    assert validator.is_valid(NOTIFICATION)
+    _rewrite(os.path.join(schema_dirs[0], "simple.json"), _drop_notification)
+    validator.reload()
+    assert not validator.is_valid(NOTIFICATION)
+
+
+def test_concurrent_validation(schema_dirs):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]])
+    path = os.path.join(schema_dirs[0], "simple.json")
+    errors = []
+    stop = threading.Event()
+
+    def validate():
+        try:
+            while not stop.is_set():
+                assert validator.is_valid(SIMPLE)
+                assert validator.is_valid(EXTERNAL)
+                validator.validate(SIMPLE)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=validate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for i in range(20):
+            _rewrite(path, lambda schema: schema["oneOf"][0].update(description=str(i)))
+            assert validator.reload() == _result(reloaded=["simple"])
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert errors == []
+
+
+def test_watcher(schema_dirs):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]])
+    reloaded = threading.Event()
+    results = []
+
+    def on_reload(result):
+        results.append(result)
+        reloaded.set()
+
+    with SchemaWatcher(validator, interval=0.01, on_reload=on_reload):
+        _rewrite(os.path.join(schema_dirs[0], "simple.json"), _drop_notification)
+        assert reloaded.wait(5)
+    assert results == [_result(reloaded=["simple"])]
+    assert not validator.is_valid(NOTIFICATION)
+
+
+def test_watcher_error(schema_dirs):
+    validator = ForisValidator([schema_dirs[0]], [schema_dirs[1]])
+    errors = []
+    watcher = SchemaWatcher(validator, on_error=errors.append)
+    with open(os.path.join(schema_dirs[0], "simple.json"), "a") as f:
+        f.write("{")
+    watcher.check()
+    assert isinstance(errors[0], ForisSchemaValidationError)
+    assert validator.is_valid(SIMPLE)
@@ -0,0 +1,113 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.cache import ResultCache
+
+
+VALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}}
+INVALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}}
+
+
+@pytest.fixture
+def validator():
+    return ForisValidator(["tests/schemas/modules/simple/"], result_cache_size=2)
+
+
+def test_disabled():
+    validator = ForisValidator(["tests/schemas/modules/simple/"])
+    assert validator.result_cache_stats() is None
+    validator.clear_result_cache()
+
+
+def test_hits(validator):
+    assert validator.is_valid(VALID)
+    assert validator.is_valid(dict(VALID))
+    validator.validate(VALID)
+    assert validator.result_cache_stats() == {
+        "hits": 2, "misses": 1, "evictions": 0, "size": 1, "maxsize": 2}
+
+
+def test_cached_error(validator):
+    with pytest.raises(ValidationError) as first:
+        validator.validate(INVALID)
+    with pytest.raises(ValidationError) as second:
+        validator.validate(INVALID)
+    assert first.value is second.value
+    assert not validator.is_valid(INVALID)
+    assert validator.result_cache_stats()["hits"] == 2
+
+
+def test_error_after_is_valid(validator):
+    assert not validator.is_valid(INVALID)
+    with pytest.raises(ValidationError) as excinfo:
+        validator.validate(INVALID)
+    assert "1 is not of type 'boolean'" in str(excinfo.value)
+
+
+def test_eviction(validator):
+    messages = [
+        {"module": "simple", "kind": "request", "action": "get"},
+        VALID,
+        INVALID,
+    ]
+    for msg in messages:
+        validator.is_valid(msg)
+    assert validator.result_cache_stats()["evictions"] == 1
+    assert validator.result_cache_stats()["size"] == 2
+    validator.is_valid(messages[0])
+    assert validator.result_cache_stats()["hits"] == 0
+
+
+def test_similar_messages(validator):
+    assert validator.is_valid(VALID)
+    # True == 1 in python, but not in json
+    assert not validator.is_valid(INVALID)
+    # keys which are not strings are not cached
+    assert not validator.is_valid(
+        {"module": "simple", "kind": "reply", "action": "get", "data": {1: True}})
+    assert not validator.is_valid(
+        {"module": "simple", "kind": "reply", "action": "get", "data": {1: True, "result": 1}})
+    assert validator.result_cache_stats()["hits"] == 0
+
+
+def test_uncacheable(validator):
+    assert not validator.is_valid({"module": "simple", "kind": "reply", "action": {"x"}})
+    with pytest.raises(ValidationError):
+        validator.validate({"module": "simple", "kind": "reply", "action": "get", "data": {
+            "result": float("nan")}})
+    assert validator.result_cache_stats()["size"] == 0
+
+
+def test_clear(validator):
+    validator.is_valid(VALID)
+    validator.clear_result_cache()
+    assert validator.result_cache_stats()["size"] == 0
+
+
+def test_put_after_clear():
+    cache = ResultCache(4)
+    fingerprint = ResultCache.fingerprint(VALID)
+    generation = cache.generation
+    cache.clear()
+    cache.put(fingerprint, VALID, True, None, generation)
+    assert cache.get(fingerprint, VALID) is None
+    cache.put(fingerprint, VALID, True, None, cache.generation)
+    assert cache.get(fingerprint, VALID) == (True, None)
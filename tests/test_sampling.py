@@ -0,0 +1,121 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.sampling import SampledValidator
+
+
+VALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}}
+INVALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}}
+NOTIFICATION = {
+    "module": "simple", "kind": "notification", "action": "triggered", "data": {"event": "x"},
+}
+BAD_ENVELOPE = {"module": "unknown", "kind": "reply", "action": "get", "data": {}}
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return ForisValidator(["tests/schemas/modules/simple/"])
+
+
+def test_rates(validator):
+    sampled = SampledValidator(validator, rate=0.5, rates={
+        ("simple", "reply"): 0.1, "simple": 0.2, (None, "reply"): 0.3, (None, "request"): 0.4,
+    })
+    assert sampled.get_rate("simple", "reply") == 0.1
+    assert sampled.get_rate("simple", "request") == 0.2
+    assert sampled.get_rate("other", "reply") == 0.3
+    assert sampled.get_rate("other", "request") == 0.4
+    assert sampled.get_rate("other", "notification") == 0.5
+
+    with pytest.raises(ValueError):
+        SampledValidator(validator, rate=1.5)
+    with pytest.raises(ValueError):
+        SampledValidator(validator, rates={"simple": -0.1})
+
+
+@pytest.mark.parametrize("method", ["validate", "is_valid"])
+def test_skipped(validator, method):
+    sampled = SampledValidator(validator, rate=0.0)
+    # only the envelope is checked
+    assert getattr(sampled, method)(INVALID) in (None, True)
+    if method == "validate":
+        with pytest.raises(ValidationError):
+            sampled.validate(BAD_ENVELOPE)
+        with pytest.raises(ValidationError):
+            sampled.validate([])
+    else:
+        assert not sampled.is_valid(BAD_ENVELOPE)
+        assert not sampled.is_valid([])
+
+    stats = sampled.stats()
+    assert stats[("simple", "reply", "get")] == {"checked": 0, "skipped": 1, "failed": 0}
+    assert stats[("unknown", "reply", "get")]["failed"] == 1
+    assert stats[(None, None, None)]["failed"] == 1
+    assert not sampled.escalated
+
+
+def test_checked(validator):
+    sampled = SampledValidator(validator, rates={"simple": 1.0}, rate=0.0)
+    sampled.validate(VALID)
+    assert sampled.is_valid(VALID)
+    with pytest.raises(ValidationError):
+        sampled.validate(INVALID)
+    assert sampled.stats()[("simple", "reply", "get")] == {
+        "checked": 2, "skipped": 0, "failed": 1}
+
+
+def test_sampling_rate(validator):
+    sampled = SampledValidator(validator, rate=0.25, seed=1)
+    for _ in range(2000):
+        sampled.validate(NOTIFICATION)
+    stats = sampled.stats()[("simple", "notification", "triggered")]
+    assert stats["checked"] + stats["skipped"] == 2000
+    assert 400 < stats["checked"] < 600
+
+
+@pytest.mark.parametrize("method", ["validate", "is_valid"])
+def test_escalation(validator, method):
+    escalations = []
+    sampled = SampledValidator(
+        validator, rate=0.0, rates={("simple", "reply"): 1.0},
+        on_escalate=lambda key, error: escalations.append((key, error)),
+    )
+    if method == "validate":
+        with pytest.raises(ValidationError):
+            sampled.validate(INVALID)
+    else:
+        assert not sampled.is_valid(INVALID)
+    assert sampled.escalated == {("simple", "get")}
+    assert len(escalations) == 1
+    assert escalations[0][0] == ("simple", "get")
+    assert isinstance(escalations[0][1], ValidationError)
+
+    # the same (module, action) with other kind is fully validated now
+    request = {"module": "simple", "kind": "request", "action": "get", "data": {"x": 1}}
+    assert not sampled.is_valid(request)
+    assert sampled.stats()[("simple", "request", "get")]["failed"] == 1
+    # other actions are still sampled
+    assert sampled.is_valid(dict(NOTIFICATION, data={"wrong": 1}))
+    assert len(escalations) == 1
+
+    sampled.reset_escalation(("simple", "get"))
+    assert not sampled.escalated
+    assert sampled.is_valid(request)
@@ -183,3 +183,73 @@ def test_no_extra_properties(validator):
         })
     assert "Additional properties are not allowed" in str(excinfo) or \
         "'event' is a required property" in str(excinfo)
+
+
+def test_action_validators(validator):
+    assert set(validator.action_validators.keys()) == {
+        ("simple", "request", "get"),
+        ("simple", "reply", "get"),
+        ("simple", "notification", "triggered"),
+    }
+    assert validator.is_valid({"module": "simple", "kind": "request", "action": "get"})
+    assert not validator.is_valid({"module": "simple", "kind": "request", "action": "triggered"})
+    assert not validator.is_valid({"module": "simple", "kind": "reply", "action": "get"})
+
+
+def test_error_message_unknown_action(validator):
+    msg = {
+        "module": "simple", "kind": "reply", "action": "non-existing",
+        "errors": [{"description": "failed", "stacktrace": ""}],
+    }
+    validator.validate(msg)
+    assert validator.is_valid(msg)
+
+
+def test_verbose_error(validator, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("schema should not be copied on failure")
+
+    monkeypatch.setattr("foris_schema.validator.copy.deepcopy", fail)
+
+    with pytest.raises(ValidationError) as excinfo:
+        validator.validate({
+            "module": "simple", "kind": "reply", "action": "get",
+            "data": {"result": "yes"}
+        })
+    assert excinfo.value.validator == "type"
+    assert list(excinfo.value.path) == ["data", "result"]
+
+
+def test_error_message_fast_path(validator, monkeypatch):
+    msg = {
+        "module": "simple", "kind": "reply", "action": "get",
+        "errors": [{"description": "failed", "stacktrace": ""}],
+    }
+
+    def fail(*args, **kwargs):
+        raise AssertionError("module schema should not be used for error messages")
+
+    monkeypatch.setattr(validator, "_get_action_validator", fail)
+    for key in validator.action_checks:
+        monkeypatch.setitem(validator.action_checks, key, fail)
+
+    validator.validate(msg)
+    assert validator.is_valid(msg)
+    assert validator.validate_many([msg])[0].error_message
+
+
+def test_invalid_errors_fallback(validator):
+    # messages with invalid "errors" are still validated against the module schema
+    msg = {
+        "module": "simple", "kind": "reply", "action": "get", "data": {"result": True},
+        "errors": [],
+    }
+    with pytest.raises(ValidationError) as excinfo:
+        validator.validate(msg)
+    assert excinfo.value.validator == "additionalProperties"
+    assert not validator.is_valid(msg)
+
+    msg["errors"] = [{"description": "failed"}]
+    with pytest.raises(ValidationError):
+        validator.validate(msg)
+    assert not validator.is_valid(msg)
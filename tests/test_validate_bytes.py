@@ -0,0 +1,137 @@
+# foris-schema
+# Copyright (C) 2026 CZ.NIC, z.s.p.o. <http://www.nic.cz>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+import pytest
+
+from jsonschema import ValidationError
+
+from foris_schema import ForisValidator
+from foris_schema.decoder import available_decoders
+from foris_schema.metrics import ValidationMetrics
+
+
+VALID = {"module": "simple", "kind": "reply", "action": "get", "data": {"result": True}}
+ERROR = {
+    "module": "simple", "kind": "reply", "action": "get",
+    "errors": [{"description": "failed", "stacktrace": ""}],
+}
+MESSAGES = [
+    VALID,
+    ERROR,
+    {"module": "simple", "kind": "reply", "action": "get", "data": {"result": 1}},
+    {"module": "simple", "kind": "reply", "action": "get"},
+    {"module": "simple", "kind": "request", "action": "get"},
+    {"module": "unknown", "kind": "reply", "action": "get", "data": {"result": True}},
+    {"module": "simple", "kind": "other", "action": "get"},
+    {"module": "simple", "kind": "reply", "action": 1},
+    {"module": "simple", "kind": "reply", "action": "get", "extra": 1},
+    {"data": {"result": True}, "action": "get", "kind": "reply", "module": "unknown"},
+    {"module": "simple", "kind": "reply"},
+    {"module": ["simple"], "kind": "reply", "action": "get"},
+    [],
+    "simple",
+]
+
+
+@pytest.fixture(params=available_decoders())
+def validator(request):
+    return ForisValidator(["tests/schemas/modules/simple/"], decoder=request.param)
+
+
+class _Decoder(object):
+    """ Counts decoded payloads """
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return self.decoder.loads(data)
+
+
+def _raises(function, *args):
+    try:
+        function(*args)
+    except ValidationError:
+        return True
+    return False
+
+
+@pytest.mark.parametrize("msg", MESSAGES)
+def test_same_as_validate(validator, msg):
+    payload = json.dumps(msg)
+    for data in (payload, payload.encode()):
+        assert _raises(validator.validate_bytes, data) == _raises(validator.validate, msg)
+
+
+def test_result(validator):
+    assert validator.validate_bytes(json.dumps(VALID).encode()) == VALID
+    assert validator.validate_bytes(bytearray(json.dumps(ERROR).encode())) == ERROR
+    assert validator.validate_bytes(json.dumps(VALID)) == VALID
+
+
+def test_bad_envelope_not_decoded(validator, monkeypatch):
+    decoder = _Decoder(validator.decoder)
+    monkeypatch.setattr(validator, "decoder", decoder)
+
+    payload = b'{"module": "unknown", "kind": "reply", "action": "get", "data": {' \
+        + b'"x": [' + b", ".join([b'"value"'] * 10000) + b"]}}"
+    with pytest.raises(ValidationError) as excinfo:
+        validator.validate_bytes(payload)
+    assert list(excinfo.value.path) == ["module"]
+    # the rest of the payload is not even parsed
+    with pytest.raises(ValidationError):
+        validator.validate_bytes(payload[:-10])
+    assert decoder.decoded == 0
+
+    validator.validate_bytes(json.dumps(VALID).encode())
+    assert decoder.decoded == 1
+
+
+@pytest.mark.parametrize("payload", [
+    '{"module": "nope", "kind": "reply", "action": "get", "data": {"result": true}, '
+    '"module": "simple"}',
+    '{"module": "nope", "kind": "reply", "action": "get", "data": {"result": true}, '
+    '"\\u006dodule": "simple"}',
+    '{"module": "simple", "kind": "reply", "action": "get", "data": {"result": true}, '
+    '"module": "nope"}',
+])
+def test_repeated_envelope(validator, payload):
+    # json decoders keep the last value of repeated keys
+    msg = json.loads(payload)
+    for data in (payload, payload.encode()):
+        assert _raises(validator.validate_bytes, data) == _raises(validator.validate, msg)
+
+
+def test_not_json(validator):
+    for payload in (b"", b"{", b"module: simple", b'{"module": "simple", "kind": "reply", '
+                    b'"action": "get", "data": {"result": true}'):
+        with pytest.raises(ValueError):
+            validator.validate_bytes(payload)
+
+
+def test_metrics():
+    metrics = ValidationMetrics()
+    validator = ForisValidator(["tests/schemas/modules/simple/"], metrics=metrics)
+    validator.validate_bytes(json.dumps(VALID).encode())
+    with pytest.raises(ValidationError):
+        validator.validate_bytes(b'{"module": "simple", "kind": "x", "action": "get"}')
+    snapshot = metrics.snapshot()
+    assert snapshot[("simple", "reply", "get")]["valid"] == 1
+    assert snapshot[("simple", "x", "get")]["invalid"] == 1